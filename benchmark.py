@@ -0,0 +1,213 @@
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from datetime import time as dtime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import calendario_investing as ci
+
+# ================== 1. CONFIGURAÇÕES ==================
+BASE_DIR = Path(__file__).parent.resolve()
+RESULTS_DIR = BASE_DIR / "bench_results"
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+IMPORTANCES = ["low", "medium", "high"]
+ZONES = {"united states": "USD", "brazil": "BRL", "euro zone": "EUR", "united kingdom": "GBP", "japan": "JPY", "china": "CNY"}
+EVENT_NAMES = [f"{base} {suffix}" for base in (
+    "Initial Jobless Claims", "Crude Oil Inventories", "Nonfarm Payrolls", "CPI (MoM)", "Retail Sales",
+    "GDP (QoQ)", "Interest Rate Decision", "Manufacturing PMI", "Trade Balance", "Industrial Production",
+) for suffix in ("", "(YoY)", "(MoM)", "Final", "Prelim")]
+
+# ================== 2. DADOS SINTÉTICOS E STUBS ==================
+
+def synthetic_calendar(rows, days=7, seed=42):
+    """Gera um calendário no formato de investpy.news.economic_calendar com `rows` linhas."""
+    rng = np.random.default_rng(seed)
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    minutes = rng.integers(0, days * 24 * 60, rows)
+    stamps = pd.to_datetime(start) + pd.to_timedelta(minutes, unit="m")
+    times = stamps.strftime("%H:%M").to_numpy(dtype=object)
+    times[rng.random(rows) < 0.02] = "All Day"
+    zones = rng.choice(list(ZONES), rows)
+    values = rng.normal(0, 2, rows).round(1).astype(str)
+    return pd.DataFrame({
+        "id": np.arange(100_000, 100_000 + rows).astype(str),
+        "date": stamps.strftime("%d/%m/%Y"),
+        "time": times,
+        "zone": zones,
+        "currency": [ZONES[z] for z in zones],
+        "importance": rng.choice(IMPORTANCES, rows, p=[0.5, 0.3, 0.2]),
+        "event": rng.choice(EVENT_NAMES, rows),
+        "actual": np.where(rng.random(rows) < 0.3, values, None),
+        "forecast": values,
+        "previous": values,
+    })
+
+
+class FrameSource(ci.CalendarSource):
+    """Fonte em memória: devolve sempre uma cópia do mesmo calendário sintético."""
+    name = "sintético"
+
+    def __init__(self, events):
+        self.events = events
+
+    def fetch(self, countries, **kwargs):
+        events = self.events[self.events['zone'].isin(countries)]
+        if kwargs.get("from_date") and kwargs.get("to_date"):
+            dates = pd.to_datetime(events['date'], format="%d/%m/%Y")
+            start, end = (pd.to_datetime(kwargs[k], format="%d/%m/%Y") for k in ("from_date", "to_date"))
+            events = events[(dates >= start) & (dates <= end)]
+        return events.copy()
+
+
+class StubTranslator:
+    """Tradutor sem rede: devolve o texto marcado, como o googletrans devolveria um objeto com `.text`."""
+    class _Result:
+        __slots__ = ("text",)
+
+        def __init__(self, text):
+            self.text = text
+
+    def translate(self, text, dest="pt"):
+        return self._Result(f"[{dest}] {text}")
+
+
+class OfflineCalendarManager(ci.CalendarManager):
+    def _get_translator(self):
+        return StubTranslator()
+
+
+class CountingNotifier(ci.Notifier):
+    """Substitui popups e som: só conta os alertas entregues."""
+    def __init__(self):
+        self.alerts = 0
+
+    def notify(self, alert_data):
+        self.alerts += 1
+
+
+def make_config(work_dir):
+    class BenchConfig(ci.Config):
+        DATA_DIR = work_dir
+        CSV_FILE = work_dir / "calendario_profit_filtrado.csv"
+        EVENT_DB_FILE = work_dir / "calendario.sqlite3"
+        PARTITION_DIR = work_dir / "partitions"
+        ALERT_DEDUP_FILE = work_dir / "alerts_sent.bin"
+        TRANSLATION_CACHE_FILE = work_dir / "translation_cache.sqlite3"
+        TRANSLATION_RATE_LIMIT = 0  # sem rede, sem limite
+    return BenchConfig
+
+# ================== 3. MEDIÇÃO ==================
+
+def load_profit_csv(path):
+    """Como os consumidores liam o calendário antes do banco: CSV com BOM e datas em texto."""
+    events = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    events["datetime"] = pd.to_datetime(events["Data"] + " " + events["Hora"], format="%d/%m/%Y %H:%M")
+    return events
+
+
+def timed(func, repeat):
+    """Executa `func` `repeat` vezes; retorna (melhor tempo em s, resultado da última execução)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def bench_size(rows, repeat):
+    events = synthetic_calendar(rows)
+    importances, start_time, end_time = IMPORTANCES, dtime(0, 0), dtime(23, 59)
+    stages = {}
+    with tempfile.TemporaryDirectory(prefix="calendar_bench_") as tmp:
+        config = make_config(Path(tmp))
+        manager = OfflineCalendarManager(config, FrameSource(events))
+
+        stages["parse_datetimes"], parsed = timed(lambda: manager._parse_datetimes(events.copy()), repeat)
+        stages["filter"], filtered = timed(lambda: manager._filter_events(parsed, importances, start_time, end_time), repeat)
+        # A primeira passada popula o cache; as medidas seguintes refletem o caso comum (nomes repetidos)
+        stages["translate_cold"], _ = timed(lambda: manager.translate_series(filtered['event']), 1)
+        stages["translate_cached"], translated = timed(lambda: manager.translate_series(filtered['event']), repeat)
+        filtered = filtered.assign(event_pt=translated)
+        stages["column_mapping"], profit = timed(lambda: manager._profit_frame(filtered), repeat)
+        stages["csv_write"], _ = timed(
+            lambda: ci.atomic_write_csv(profit, config.CSV_FILE, index=False, encoding="utf-8-sig"), repeat)
+        stages["download_total"], _ = timed(
+            lambda: manager.download_calendar(importances, start_time, end_time, incremental=False, countries=list(ZONES)), 1)
+
+        # Leitura do horizonte inteiro: banco tipado x o mesmo conteúdo em CSV (texto + parse de datas)
+        horizon = manager._horizon()
+        stages["store_load"], stored = timed(lambda: manager.event_db.read(horizon), repeat)
+        horizon_csv = Path(tmp) / "horizonte.csv"
+        ci.atomic_write_csv(manager._profit_frame(stored), horizon_csv, index=False, encoding="utf-8-sig")
+        stages["csv_load"], _ = timed(lambda: load_profit_csv(horizon_csv), repeat)
+
+        # Alertas: "agora" fixado 4 minutos antes do evento mediano, para que a janela tenha eventos
+        alert_service = ci.AlertService(config, [CountingNotifier()])
+        stages["alert_reload"], _ = timed(alert_service.event_index.refresh, 1)
+        store = alert_service.event_index.store
+        now = float(store.times[len(store) // 2]) - 4 * 60 if len(store) else time.time()
+        stages["alert_check"], _ = timed(lambda: alert_service.check_events(now=now), repeat)
+        alert_service.event_index.event_db.close()
+        manager.event_db.close()
+
+    return {
+        "rows": rows,
+        "filtered_rows": int(len(filtered)),
+        "unique_events": int(filtered['event'].nunique()),
+        "stored_rows": int(len(stored)),
+        "alert_store_bytes": store.memory_usage(),
+        "seconds": stages,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+# ================== 4. EXECUÇÃO PRINCIPAL ==================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline do pipeline download → filtro → tradução → CSV e do alerta.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Quantidades de linhas a testar.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições por etapa (vale o melhor tempo).")
+    parser.add_argument("--output", type=Path, help="Arquivo JSON de saída (padrão: bench_results/<data>_<commit>.json).")
+    parser.add_argument("--verbose", action="store_true", help="Mostra os logs do aplicativo durante as medições.")
+    args = parser.parse_args()
+
+    if args.verbose:
+        ci.setup_logging()
+    revision = git_revision()
+    report = {
+        "commit": revision,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "results": [],
+    }
+    for rows in args.sizes:
+        result = bench_size(rows, args.repeat)
+        report["results"].append(result)
+        stages = "  ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in result["seconds"].items())
+        print(f"{rows:>9} linhas ({result['filtered_rows']} filtradas): {stages}")
+
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d_%H%M%S}_{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResultados salvos em: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
+import argparse
+import json
 import os
+import statistics
 import subprocess
 import sys
 import shutil
+import time
+from datetime import datetime
 from pathlib import Path
 
 # ================== 1. CONFIGURAÇÕES ==================
@@ -20,9 +25,25 @@ ICON_PATH = BASE_DIR / "image" / "AJJ_ComCor.ico"
 # Pastas para incluir no executável
 DATA_TO_ADD = ["image", "sound"]
 
+# Módulos importados sob demanda (timed_import), invisíveis para a análise do PyInstaller
+HIDDEN_IMPORTS = ["calendario_ui", "pygame", "googletrans", "investpy"]
+
+# Módulos que o aplicativo não usa, mas que a análise do PyInstaller arrasta junto com pandas/PIL
+EXCLUDES = [
+    "matplotlib", "scipy", "IPython", "jedi", "notebook", "pytest", "psutil",
+    "PyQt5", "PyQt6", "PySide2", "PySide6", "sqlalchemy", "pandas.tests", "numpy.tests",
+]
+
 # Pastas geradas pelo PyInstaller que serão limpas
 BUILD_DIR = BASE_DIR / "build"
 DIST_DIR = BASE_DIR / "dist"
+# Imagens da interface já no tamanho final, geradas a cada build (ver Config.UI_IMAGE_SIZES)
+RESIZED_ASSETS_DIR = BUILD_DIR / "assets" / "resized"
+RESULTS_DIR = BASE_DIR / "bench_results"
+
+# onefile: um único .exe que se descompacta num diretório temporário a cada execução.
+# onedir: pasta com o .exe e a _internal já extraída; abre mais rápido, inclusive no --background-update.
+PROFILES = ["onefile", "onedir"]
 
 # ================== 2. FUNÇÕES AUXILIARES ==================
 
@@ -55,7 +76,28 @@ def clean_previous_builds():
         spec_file.unlink()
         print(f"Arquivo '{spec_file.name}' removido.")
 
-def build_executable():
+def prepare_resized_assets():
+    """Redimensiona as imagens da interface no build, para o _setup_ui não rodar LANCZOS a cada abertura."""
+    from PIL import Image
+    sys.path.insert(0, str(BASE_DIR))
+    from calendario_investing import Config
+
+    RESIZED_ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+    for image_name, size in Config.UI_IMAGE_SIZES.items():
+        source = BASE_DIR / "image" / image_name
+        if not source.exists():
+            print(f"Aviso: A imagem '{image_name}' não foi encontrada e será redimensionada em tempo de execução.")
+            continue
+        target = RESIZED_ASSETS_DIR / Config.resized_image_path(image_name, size).name
+        Image.open(source).resize(size, Image.Resampling.LANCZOS).save(target, optimize=True)
+    print(f"Imagens pré-redimensionadas em: {RESIZED_ASSETS_DIR}")
+
+def executable_path(profile):
+    if profile == "onedir":
+        return DIST_DIR / EXE_NAME / f"{EXE_NAME}.exe"
+    return DIST_DIR / f"{EXE_NAME}.exe"
+
+def build_executable(profile="onefile"):
     """Constrói e executa o comando PyInstaller de forma segura."""
     script_path = BASE_DIR / SCRIPT_NAME
     if not script_path.exists():
@@ -67,9 +109,12 @@ def build_executable():
         sys.executable,  # Caminho para o interpretador Python
         '-m', 'PyInstaller',
         '--noconsole',          # '--windowed' é um alias para isso
-        '--onefile',
+        f'--{profile}',
         '--name', EXE_NAME,
         '--icon', str(ICON_PATH),
+        # Cada perfil tem sua própria pasta de trabalho, para os dois poderem ser gerados na mesma execução
+        '--workpath', str(BUILD_DIR / profile),
+        '--specpath', str(BUILD_DIR / profile),
         # --- CORREÇÃO APLICADA AQUI ---
         # Este argumento embute um manifesto no .exe que diz ao Windows
         # para SEMPRE solicitar permissão de administrador ao ser executado.
@@ -85,6 +130,13 @@ def build_executable():
             command.extend(['--add-data', f'{folder_path}{os.pathsep}{folder_name}'])
         else:
             print(f"Aviso: A pasta de dados '{folder_name}' não foi encontrada e será ignorada.")
+    if RESIZED_ASSETS_DIR.exists():
+        command.extend(['--add-data', f'{RESIZED_ASSETS_DIR}{os.pathsep}image/resized'])
+
+    for module_name in HIDDEN_IMPORTS:
+        command.extend(['--hidden-import', module_name])
+    for module_name in EXCLUDES:
+        command.extend(['--exclude-module', module_name])
 
     command.append(str(script_path))
 
@@ -98,18 +150,60 @@ def build_executable():
 
     try:
         # Executa o comando
-        print("\nIniciando a compilação... Isso pode levar alguns minutos.")
+        print(f"\nIniciando a compilação ({profile})... Isso pode levar alguns minutos.")
         subprocess.check_call(command)
         print("\n" + "="*50)
-        print(f"✅ Executável criado com sucesso em: {DIST_DIR / (EXE_NAME + '.exe')}")
+        print(f"✅ Executável criado com sucesso em: {executable_path(profile)}")
         print("="*50)
     except subprocess.CalledProcessError as e:
         print(f"\n❌ Erro durante a compilação do PyInstaller: {e}", file=sys.stderr)
         sys.exit(1)
 
+def measure_startup(profile, runs=5):
+    """
+    Mede o tempo de abertura do executável (--startup-probe fecha a janela assim que ela fica ociosa
+    e não liga o monitoramento nem a atualização inicial, então a medida não depende da rede nem do investing.com).
+    A primeira execução após o build é a 'fria'; a mediana das seguintes é a 'quente'.
+    No onefile toda execução paga a extração para o _MEIxxxx, então fria e quente ficam próximas.
+    """
+    exe = executable_path(profile)
+    if not exe.exists():
+        print(f"Aviso: '{exe}' não encontrado; medição de {profile} ignorada.")
+        return None
+    timings = []
+    for _ in range(runs + 1):
+        started = time.perf_counter()
+        try:
+            subprocess.run([str(exe), '--startup-probe'], check=False)
+        except OSError as e:
+            # O .exe pede administrador (--uac-admin): fora de um shell elevado o Windows recusa (WinError 740)
+            print(f"Aviso: não foi possível executar '{exe}' ({e}); rode a medição num terminal como administrador. Medição de {profile} ignorada.")
+            return None
+        timings.append(time.perf_counter() - started)
+    result = {"profile": profile, "cold_seconds": timings[0], "warm_seconds": statistics.median(timings[1:]), "runs": timings}
+    print(f"{profile:>8}: fria {result['cold_seconds']:.2f} s | quente {result['warm_seconds']:.2f} s (mediana de {runs})")
+    return result
+
 # ================== 3. EXECUÇÃO PRINCIPAL ==================
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera o executável do Calendário Econômico com PyInstaller.")
+    parser.add_argument("--profile", choices=PROFILES + ["both"], default="onefile", help="Layout do build (padrão: onefile).")
+    parser.add_argument("--measure-startup", action="store_true", help="Mede o tempo de abertura fria e quente de cada layout gerado.")
+    parser.add_argument("--runs", type=int, default=5, help="Execuções quentes por layout na medição.")
+    args = parser.parse_args()
+    profiles = PROFILES if args.profile == "both" else [args.profile]
+
     check_pyinstaller()
     clean_previous_builds()
-    build_executable()
+    prepare_resized_assets()
+    for profile in profiles:
+        build_executable(profile)
+
+    if args.measure_startup:
+        print("\nMedindo o tempo de abertura...")
+        results = [r for r in (measure_startup(profile, args.runs) for profile in profiles) if r]
+        output = RESULTS_DIR / f"startup_{datetime.now():%Y%m%d_%H%M%S}.json"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Resultados salvos em: {output}")
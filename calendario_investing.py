@@ -1,234 +1,2189 @@
+import time as t_sleep
+_PROCESS_START = t_sleep.perf_counter()
+
 import os
 import sys
 import subprocess
 import threading
-import time as t_sleep
 import logging
+import importlib
 from datetime import datetime, time, timedelta
 from pathlib import Path
 import json
+import random
 import ctypes
+import socket
+import sqlite3
+import struct
+import tempfile
+import urllib.parse
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Tempo de importação (s) dos módulos pesados, exibido com --timing
+IMPORT_TIMINGS = {}
 
-import pandas as pd
-import psutil
-import pytz
-import ttkbootstrap as ttk
-from ttkbootstrap.constants import *
-from PIL import Image, ImageTk
-import webbrowser
-import pygame
-from googletrans import Translator
+def timed_import(module_name):
+    """Importa um módulo registrando o custo da primeira importação. Usado também para importações sob demanda."""
+    already_loaded = module_name in sys.modules
+    started = t_sleep.perf_counter()
+    module = importlib.import_module(module_name)
+    if not already_loaded:
+        IMPORT_TIMINGS[module_name] = t_sleep.perf_counter() - started
+    return module
+
+np = timed_import("numpy")
+pd = timed_import("pandas")
+pytz = timed_import("pytz")
 
 # ================== 1. CONFIGURAÇÃO E INICIALIZAÇÃO ==================
 log_dir = Path.home() / "AppData" / "Local" / "CalendarApp"
-log_dir.mkdir(exist_ok=True)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_dir / "app.log"),
-        logging.StreamHandler()
-    ]
-)
-
-def kill_previous_instances():
-    # (Código inalterado)
-    current_pid = os.getpid()
-    try:
-        current_exe = psutil.Process(current_pid).exe()
-        for proc in psutil.process_iter(['pid', 'name', 'exe']):
-            if proc.info['exe'] == current_exe and proc.pid != current_pid:
-                logging.warning(f"Encerrando processo antigo: PID {proc.pid}")
-                proc.terminate()
-                try:
-                    proc.wait(timeout=5)
-                except psutil.TimeoutExpired:
-                    proc.kill()
-    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
-        logging.error(f"Erro ao tentar encerrar processos antigos: {e}")
+LOG_MAX_BYTES = 2 * 1024 * 1024  # app.log é rotacionado ao atingir 2 MB...
+LOG_BACKUP_COUNT = 5             # ...mantendo app.log.1 a app.log.5
+LOG_REPEAT_WINDOW_SECONDS = 3600  # avisos/erros idênticos: só as primeiras ocorrências por hora vão ao log
+LOG_REPEAT_BURST = 3
+
+
+class RepeatFilter(logging.Filter):
+    """
+    Limita avisos e erros repetidos: cada mensagem idêntica passa `burst` vezes por janela; as demais
+    só são contadas e saem resumidas ("repetida ×240 na última hora") na próxima ocorrência após a janela.
+    """
+    MAX_TRACKED = 1000
+
+    def __init__(self, window, burst):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._seen = OrderedDict()  # (nível, mensagem) -> [início da janela, ocorrências, suprimidas]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING: return True
+        key = (record.levelno, record.getMessage())
+        now = record.created
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is None or now - entry[0] >= self.window:
+                suppressed = entry[2] if entry else 0
+                self._seen[key] = [now, 1, 0]
+                self._seen.move_to_end(key)
+                while len(self._seen) > self.MAX_TRACKED:
+                    self._seen.popitem(last=False)
+                if suppressed:
+                    record.msg, record.args = f"{key[1]} (repetida ×{suppressed} além das {self.burst} primeiras na última janela)", None
+                return True
+            entry[1] += 1
+            if entry[1] <= self.burst: return True
+            entry[2] += 1
+            return False
+
+    def flush(self):
+        """Registra o total das mensagens ainda suprimidas (chamado ao encerrar)."""
+        with self._lock:
+            pending = [(level, message, entry[2]) for (level, message), entry in self._seen.items() if entry[2]]
+            self._seen.clear()
+        for level, message, suppressed in pending:
+            logging.log(level, f"{message} (repetida ×{suppressed} além das {self.burst} primeiras na última janela)")
+
+
+def setup_logging():
+    """
+    Os logs vão para uma fila; uma thread grava em disco (app.log com rotação) e no console, para que
+    alertas e downloads nunca esperem pelo arquivo. Repetições de avisos/erros são limitadas por RepeatFilter.
+    """
+    import atexit
+    import queue
+    import logging.handlers
+    log_dir.mkdir(parents=True, exist_ok=True)
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_dir / "app.log", maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True)
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))  # o formato completo é aplicado na thread de escrita
+    repeat_filter = RepeatFilter(LOG_REPEAT_WINDOW_SECONDS, LOG_REPEAT_BURST)
+    queue_handler.addFilter(repeat_filter)
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+
+    listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)  # atexit roda na ordem inversa: resumo das repetições, depois esvazia a fila
+    atexit.register(repeat_filter.flush)
+
+def log_import_report(stage):
+    """Registra o custo de importação por módulo e o tempo desde o início do processo (flag --timing)."""
+    elapsed = t_sleep.perf_counter() - _PROCESS_START
+    logging.info(f"[timing] {stage}: {elapsed * 1000:.0f} ms desde o início do processo")
+    for module_name, seconds in sorted(IMPORT_TIMINGS.items(), key=lambda item: item[1], reverse=True):
+        logging.info(f"[timing]   import {module_name:<14} {seconds * 1000:8.1f} ms")
+
+
+class Metrics:
+    """
+    Contadores, valores e tempos das etapas críticas (download, tradução, CSV, alertas, popups).
+    Exporta snapshots periódicos num arquivo JSON lines rotativo e, opcionalmente, no formato
+    texto do Prometheus em http://127.0.0.1:<porta>/metrics.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.summaries = {}  # nome -> {"count", "sum", "max", "last"}
+        self._exporting = threading.Event()
+        self._http_server = None
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name, value):
+        with self._lock:
+            summary = self.summaries.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0, "last": 0.0})
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["max"] = max(summary["max"], value)
+            summary["last"] = value
+
+    @contextmanager
+    def timer(self, name):
+        started = t_sleep.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, t_sleep.perf_counter() - started)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "ts": datetime.now().isoformat(timespec="seconds"),
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "summaries": {name: dict(summary) for name, summary in self.summaries.items()},
+            }
+
+    def write_snapshot(self, path, max_bytes=5 * 1024 * 1024):
+        """Acrescenta um snapshot ao arquivo JSON lines, rotacionando para .1 quando passa de max_bytes."""
+        path = Path(path)
+        try:
+            if path.exists() and path.stat().st_size > max_bytes:
+                os.replace(path, path.with_name(path.name + ".1"))
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.snapshot(), ensure_ascii=False) + "\n")
+        except OSError as e:
+            logging.error(f"Erro ao gravar métricas em {path}: {e}")
+
+    def prometheus_text(self, prefix="calendario_"):
+        snap = self.snapshot()
+        lines = []
+        for name, value in sorted(snap["counters"].items()):
+            lines += [f"# TYPE {prefix}{name} counter", f"{prefix}{name} {value}"]
+        for name, value in sorted(snap["gauges"].items()):
+            lines += [f"# TYPE {prefix}{name} gauge", f"{prefix}{name} {value}"]
+        for name, summary in sorted(snap["summaries"].items()):
+            lines += [f"# TYPE {prefix}{name} summary",
+                      f"{prefix}{name}_count {summary['count']}",
+                      f"{prefix}{name}_sum {summary['sum']}",
+                      f"# TYPE {prefix}{name}_max gauge",
+                      f"{prefix}{name}_max {summary['max']}"]
+        return "\n".join(lines) + "\n"
+
+    def start_export(self, path, interval, port=None):
+        """Grava snapshots a cada `interval` segundos e, se `port` for dado, serve /metrics só em localhost."""
+        if self._exporting.is_set(): return
+        self._exporting.set()
+
+        def export_loop():
+            while self._exporting.is_set():
+                self.write_snapshot(path)
+                t_sleep.sleep(interval)
+        threading.Thread(target=export_loop, daemon=True).start()
+
+        if port:
+            metrics = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.rstrip('/') != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = metrics.prometheus_text().encode('utf-8')
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass  # sem uma linha de log por coleta
+
+            try:
+                self._http_server = ThreadingHTTPServer(("127.0.0.1", int(port)), Handler)
+            except OSError as e:
+                logging.error(f"Não foi possível abrir o endpoint de métricas na porta {port}: {e}")
+                return
+            threading.Thread(target=self._http_server.serve_forever, daemon=True).start()
+            logging.info(f"Métricas disponíveis em http://127.0.0.1:{port}/metrics")
+
+    def stop_export(self):
+        self._exporting.clear()
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server = None
 
-kill_previous_instances()
+
+METRICS = Metrics()
 
 
 class Config:
     APP_NAME = "Calendário Econômico"
     # --- MUDANÇA: Nomes base para as tarefas ---
     TASK_NAME_LOGON = "AtualizarCalendario_Logon"
-    TASK_NAME_DAILY = "AtualizarCalendario_Diario"
+    TASK_NAME_WATCHDOG = "AtualizarCalendario_Watchdog"
+    TASK_NAME_DAILY = "AtualizarCalendario_Diario"  # versões antigas: removida ao recriar as tarefas
     TIMEZONE = pytz.timezone('America/Sao_Paulo')
     
     if getattr(sys, 'frozen', False):
         BASE_DIR = Path(sys._MEIPASS)
     else:
         BASE_DIR = Path(__file__).parent
+    # Build onedir (build_exe.py --profile onedir): os dados ficam ao lado do .exe, não num _MEIxxxx temporário
+    ONEDIR_BUILD = getattr(sys, 'frozen', False) and BASE_DIR.parent == Path(sys.executable).parent
 
-    DATA_DIR = Path(os.getenv("USERPROFILE")) / "Profit" / "Calendar"
+    DATA_DIR = Path(os.getenv("USERPROFILE") or Path.home()) / "Profit" / "Calendar"
     CSV_FILE = DATA_DIR / "calendario_profit_filtrado.csv"
-    EXE_DESTINATION = DATA_DIR / "CalendarioEconomico.exe"
+    EVENT_DB_FILE = DATA_DIR / "calendario.sqlite3"  # eventos publicados + identidade, tipados; o CSV do Profit é gerado daqui
+    PARTITION_DIR = DATA_DIR / "partitions"  # resposta bruta de cada país, um CSV por dia; mantida se a próxima busca falhar
+    HORIZON_DAYS = 7  # hoje + os próximos 7 dias
+    FETCH_CHUNK_DAYS = 2  # dias consecutivos por requisição
+    REFRESH_ALWAYS_DAYS = 2  # hoje e amanhã são sempre rebuscados; os demais dias só quando envelhecem
+    DAY_MAX_AGE_SECONDS = 6 * 3600
+    EXPORT_DAYS = 1  # dias a partir de hoje no CSV do Profit
+    if ONEDIR_BUILD:
+        EXE_DESTINATION = DATA_DIR / "CalendarioEconomico" / "CalendarioEconomico.exe"
+    else:
+        EXE_DESTINATION = DATA_DIR / "CalendarioEconomico.exe"
     
     IMAGE_DIR = BASE_DIR / "image"
     SOUND_DIR = BASE_DIR / "sound"
+    RESIZED_IMAGE_DIR = IMAGE_DIR / "resized"  # gerada pelo build_exe.py
+    UI_IMAGE_SIZES = {
+        "QRcode.png": (150, 150), "AJJ_LogoColorido.png": (150, 120),
+        "linkedin.png": (32, 32), "github-mark.png": (32, 32), "instagram.png": (32, 32),
+    }
     SETTINGS_FILE = DATA_DIR / "settings.json"
+    TRANSLATION_CACHE_FILE = DATA_DIR / "translation_cache.sqlite3"
+    TRANSLATION_CACHE_MAX_ENTRIES = 5000
+    TRANSLATION_MAX_WORKERS = 4
+    TRANSLATION_RATE_LIMIT = 10.0  # requisições por segundo ao tradutor
+    FETCH_MAX_WORKERS = 4  # países buscados em paralelo
+    REFRESH_TIMES = ("08:30", "12:30", "16:30")  # atualizações dentro do monitor; "*:15" = toda hora aos 15 min
+    REFRESH_JITTER_SECONDS = 120  # atraso aleatório de até 2 min, para não bater na fonte sempre no mesmo segundo
+    REFRESH_BACKOFF_BASE_SECONDS = 60  # após falha: 1, 2, 4... min, até o máximo ou o próximo horário
+    REFRESH_BACKOFF_MAX_SECONDS = 30 * 60
+    REFRESH_TIMEOUT_SECONDS = 120  # download + tradução; passado isso, o monitor segue com o calendário anterior
     
+    ALERT_LEAD_SECONDS = 5 * 60  # alerta 5 minutos antes do evento
+    ALERT_IDLE_FALLBACK_SECONDS = 30 * 60  # sem prazos, dorme até a virada do dia ou um aviso de recarga; isto é só a rede de segurança
+    ALERT_DEDUP_FILE = DATA_DIR / "alerts_sent.bin"  # alertas já entregues, para um reinício não repeti-los
+    ALERT_COALESCE_SECONDS = 60  # eventos até 1 minuto após o primeiro saem num único alerta agrupado
+    ACTUALS_POLL_OFFSETS = (30, 120, 300)  # segundos após a divulgação para buscar o valor 'Real'
+
+    SOUND_CHANNELS = 8  # alertas simultâneos tocam em canais separados
+    DEFAULT_SOUND = "medium.mp3"  # sem "selected_sound" em settings.json
+    IMPORTANCE_SOUNDS = {"High": "high.mp3", "Medium": "medium.mp3", "Low": "low.mp3"}  # com "sound_by_importance" em settings.json
+    SOUND_BUFFER = 512  # amostras no buffer do mixer (~12 ms a 44,1 kHz)
+
+    METRICS_FILE = log_dir / "metrics.jsonl"
+    ALERTS_JSONL_FILE = log_dir / "alerts.jsonl"  # notificador "jsonl" do modo --daemon
+    DAEMON_NOTIFIERS = ("console",)  # padrão de --notify (console, jsonl, sound, api)
+    API_DEFAULT_PORT = 8765
+    METRICS_INTERVAL_SECONDS = 60
+
     IMPORTANCE_STARS = {"High": "★★★", "Medium": "★★", "Low": "★"}
     COLOR_MAP = {"High": "danger", "Medium": "warning", "Low": "info"}
-    
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    IMAGE_DIR.mkdir(exist_ok=True)
-    SOUND_DIR.mkdir(exist_ok=True)
+    POPUP_POOL_SIZE = 3   # popups pré-criados na abertura
+    POPUP_POOL_MAX = 10   # limite de janelas de alerta simultâneas
+
+    @classmethod
+    def resized_image_path(cls, image_name, size):
+        """Caminho da versão pré-redimensionada de uma imagem da interface."""
+        return cls.RESIZED_IMAGE_DIR / f"{Path(image_name).stem}_{size[0]}x{size[1]}.png"
+
+    @classmethod
+    def ensure_dirs(cls):
+        cls.DATA_DIR.mkdir(parents=True, exist_ok=True)
+        cls.IMAGE_DIR.mkdir(exist_ok=True)
+        cls.SOUND_DIR.mkdir(exist_ok=True)
+
+
+def filters_from_settings(settings):
+    """Converte as importâncias e horários salvos em settings.json nos argumentos de download_calendar."""
+    importances = settings.get("importances", ["low", "medium", "high"])
+    start_h, start_m = settings.get("start_time", "08:45").split(':')
+    end_h, end_m = settings.get("end_time", "17:45").split(':')
+    return importances, time(int(start_h), int(start_m)), time(int(end_h), int(end_m))
+
+
+def seconds_until_midnight(timezone, now_ts=None):
+    """Segundos até a próxima meia-noite no fuso dado (quando "hoje" muda para os índices e rastreadores)."""
+    now = datetime.fromtimestamp(now_ts if now_ts is not None else t_sleep.time(), timezone)
+    midnight = timezone.localize(datetime.combine(now.date() + timedelta(days=1), time()))
+    return max(0.0, (midnight - now).total_seconds())
+
+
+def countries_from_settings(settings):
+    """Países monitorados (nomes do investing.com, ex.: "euro zone"), configuráveis em settings.json."""
+    return settings.get("countries") or list(CalendarManager.COUNTRIES)
+
+
+def load_settings_file(config):
+    """Lê settings.json (gravado pela janela); sem arquivo ou com erro, devolve {} e valem os padrões."""
+    try:
+        if config.SETTINGS_FILE.exists():
+            with open(config.SETTINGS_FILE, 'r') as f:
+                return json.load(f)
+    except (IOError, json.JSONDecodeError) as e:
+        logging.error(f"Não foi possível carregar configurações de {config.SETTINGS_FILE}: {e}")
+    return {}
+
+
+def remove_app_data(config):
+    """
+    Apaga os dados do app em DATA_DIR (CSV, configurações, banco de eventos, partições, cache de
+    traduções, alertas entregues e lock). Arquivos ainda abertos ficam para trás sem erro; chame de
+    novo depois de fechar as conexões e liberar o SingleInstance.
+    """
+    paths = [config.CSV_FILE, config.SETTINGS_FILE, config.ALERT_DEDUP_FILE,
+             config.DATA_DIR / "calendario_estado.csv",  # estado em CSV de versões antigas
+             config.DATA_DIR / "monitor.lock", config.DATA_DIR / "monitor.port"]
+    for db_path in (config.EVENT_DB_FILE, config.TRANSLATION_CACHE_FILE):
+        paths += [db_path.with_name(db_path.name + suffix) for suffix in ("", "-wal", "-shm", "-journal")]
+    for path in paths:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            logging.warning(f"Não foi possível apagar {path}: {e}")
+    import shutil
+    for directory in (config.PARTITION_DIR, config.DATA_DIR / "days"):  # "days": partições de versões antigas
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class SingleInstance:
+    """
+    Garante uma única instância do monitor sem varrer processos: um lock exclusivo de arquivo
+    (liberado pelo SO se o processo morrer) e um socket local por onde outras execuções
+    entregam comandos ("show", "refresh") à instância ativa.
+    """
+    def __init__(self, data_dir, name="monitor"):
+        self.lock_path = Path(data_dir) / f"{name}.lock"
+        self.port_path = Path(data_dir) / f"{name}.port"
+        self.handlers = {}  # comando -> função chamada na thread do socket
+        self._lock_file = None
+        self._server = None
+
+    def _try_lock(self, f):
+        f.seek(0)
+        if sys.platform == 'win32':
+            import msvcrt
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def acquire(self):
+        """Tenta se tornar a instância principal. Retorna False se outra já estiver rodando."""
+        f = open(self.lock_path, 'a+')
+        try:
+            self._try_lock(f)
+        except OSError:
+            f.close()
+            return False
+        self._lock_file = f
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(("127.0.0.1", 0))
+        self._server.listen(4)
+        port = self._server.getsockname()[1]
+        tmp_path = self.port_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"pid": os.getpid(), "port": port}))
+        os.replace(tmp_path, self.port_path)
+        threading.Thread(target=self._serve, daemon=True).start()
+        logging.info(f"Instância principal registrada (PID {os.getpid()}, porta local {port}).")
+        return True
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return  # socket fechado em release()
+            with conn:
+                try:
+                    conn.settimeout(2.0)
+                    command = json.loads(conn.makefile('r', encoding='utf-8').readline() or '{}').get("command")
+                    handler = self.handlers.get(command)
+                    logging.info(f"Comando recebido de outra instância: {command}")
+                    if handler: handler()
+                    conn.sendall(b"ok\n" if handler else b"unknown\n")
+                except (OSError, ValueError) as e:
+                    logging.error(f"Erro ao atender comando de outra instância: {e}")
+
+    def send(self, command, timeout=2.0):
+        """Entrega um comando à instância ativa. Retorna True se ela o aceitou."""
+        try:
+            port = json.loads(self.port_path.read_text())["port"]
+            with socket.create_connection(("127.0.0.1", port), timeout=timeout) as conn:
+                conn.sendall((json.dumps({"command": command}) + "\n").encode('utf-8'))
+                return conn.makefile('r', encoding='utf-8').readline().strip() == "ok"
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def release(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        if self._lock_file is not None:
+            try:
+                self.port_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            self._lock_file.close()
+            self._lock_file = None
 
 # ================== 2. CLASSES DE LÓGICA ==================
 
+def atomic_write_csv(df, path, retries=5, **to_csv_kwargs):
+    """Grava o CSV num arquivo temporário ao lado do destino e o publica com rename atômico."""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.stem}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding=to_csv_kwargs.pop("encoding", "utf-8")) as f:
+            df.to_csv(f, **to_csv_kwargs)
+        for attempt in range(retries):
+            try:
+                os.replace(tmp_name, path)
+                return
+            except PermissionError:
+                # No Windows o rename falha enquanto outro processo (ex.: Profit) mantém o arquivo aberto
+                if attempt == retries - 1: raise
+                t_sleep.sleep(0.2 * (attempt + 1))
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+
+class DayPartitions:
+    """Eventos particionados por dia: um CSV por data (AAAA-MM-DD.csv), lido só para os dias consultados."""
+    def __init__(self, directory, columns):
+        self.directory = Path(directory)
+        self.columns = list(columns)
+
+    def path(self, day):
+        return self.directory / f"{day:%Y-%m-%d}.csv"
+
+    def days(self):
+        days = []
+        for path in self.directory.glob("*.csv"):
+            try:
+                days.append(datetime.strptime(path.stem, "%Y-%m-%d").date())
+            except ValueError:
+                continue
+        return sorted(days)
+
+    def age(self, day):
+        """Segundos desde a última gravação do dia, ou None se ele nunca foi gravado."""
+        try:
+            return t_sleep.time() - self.path(day).stat().st_mtime
+        except OSError:
+            return None
+
+    def read(self, days):
+        """Concatena as partições existentes de `days`; None se nenhuma existir."""
+        frames = [pd.read_csv(self.path(day), dtype=str, keep_default_na=False) for day in days if self.path(day).exists()]
+        return pd.concat(frames, ignore_index=True) if frames else None
+
+    def write(self, day, events):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write_csv(events.reindex(columns=self.columns), self.path(day), index=False)
+
+    def drop_before(self, day):
+        for old in self.days():
+            if old < day: self.path(old).unlink(missing_ok=True)
+
+
+class EventDatabase:
+    """
+    Armazenamento interno em colunas binárias (SQLite, uma linha por dia): horários como int64 ordenado e
+    cada coluna de texto codificada em dicionário (códigos int32 + valores distintos). Ler um dia não passa
+    por CSV nem por parse de datas; alertas e interface leem daqui e o CSV do Profit é só uma exportação.
+    """
+    SEPARATOR = "\x1f"  # separador de unidade ASCII entre os valores distintos de uma coluna
+
+    def __init__(self, db_path, columns, timezone):
+        self.db_path = db_path
+        self.columns = list(columns)
+        self.timezone = timezone
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")  # leitores (alertas, interface) não esperam a gravação do refresh
+        encoded_columns = ", ".join(f'"{column}_codes" BLOB NOT NULL, "{column}_values" TEXT NOT NULL' for column in self.columns)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS days (day TEXT PRIMARY KEY, rows INTEGER NOT NULL,"
+                f" first_ts INTEGER, last_ts INTEGER, event_ts BLOB NOT NULL, {encoded_columns})"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_days_range ON days (first_ts, last_ts)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL NOT NULL)")
+
+    def _encode(self, values):
+        codes, uniques = pd.factorize(values.str.replace(self.SEPARATOR, ' ', regex=False))
+        return codes.astype(np.int32).tobytes(), self.SEPARATOR.join(uniques)
+
+    def _decode(self, codes, uniques):
+        return np.array(uniques.split(self.SEPARATOR), dtype=object)[np.frombuffer(codes, dtype=np.int32)]
+
+    def _bump_revision(self):
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('revision', COALESCE((SELECT value FROM meta WHERE key = 'revision'), 0) + 1)")
+        self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('updated_at', ?)", (t_sleep.time(),))
+
+    def _meta(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def revision(self):
+        """Muda a cada gravação; usado pelos leitores para saber se precisam recarregar."""
+        return int(self._meta('revision') or 0)
+
+    def mark_refreshed(self):
+        """Registra uma atualização completa bem-sucedida, mesmo sem mudanças (não muda a revisão)."""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)", (t_sleep.time(),))
+
+    def refreshed_at(self):
+        """Momento (epoch) da última atualização completa; bancos antigos caem na última gravação."""
+        value = self._meta('refreshed_at') or self._meta('updated_at')
+        return float(value) if value is not None else None
+
+    def replace_days(self, days, events):
+        """Substitui, numa única transação, os eventos de `days` pelos de `events` (que precisa da coluna 'datetime')."""
+        event_ts = events['datetime'].dt.tz_localize(self.timezone, ambiguous='NaT', nonexistent='NaT')
+        valid = event_ts.notna().to_numpy()
+        event_ts = event_ts[valid].dt.as_unit('s').astype('int64').to_numpy()
+        order = np.argsort(event_ts, kind='stable')
+        event_ts = event_ts[order]
+        values = events[valid].reindex(columns=self.columns).fillna('').astype(str).iloc[order]
+        event_days = events['datetime'][valid].dt.date.to_numpy()[order]
+        rows = []
+        for day in days:
+            in_day = event_days == day
+            day_ts, day_values = event_ts[in_day], values[in_day]
+            encoded = [part for column in self.columns for part in self._encode(day_values[column])]
+            rows.append((
+                f"{day:%Y-%m-%d}", len(day_ts),
+                int(day_ts[0]) if len(day_ts) else None, int(day_ts[-1]) if len(day_ts) else None,
+                day_ts.tobytes(), *encoded,
+            ))
+        placeholders = ", ".join("?" * (2 * len(self.columns) + 5))
+        with self._lock, self._conn:
+            self._conn.executemany(f"INSERT OR REPLACE INTO days VALUES ({placeholders})", rows)
+            self._bump_revision()
+
+    def update_actuals(self, actual_by_id):
+        """Grava o 'Real' dos eventos que ainda não o tinham. Retorna os ids atualizados."""
+        updated = set()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT day, event_id_codes, event_id_values, actual_codes, actual_values FROM days WHERE rows > 0").fetchall()
+            for day, id_codes, id_values, actual_codes, actual_values in rows:
+                ids, actuals = self._decode(id_codes, id_values), self._decode(actual_codes, actual_values)
+                mask = (actuals == '') & np.isin(ids, actual_by_id.index)
+                if not mask.any(): continue
+                actuals[mask] = actual_by_id.reindex(ids[mask]).to_numpy()
+                updated.update(ids[mask])
+                self._conn.execute("UPDATE days SET actual_codes = ?, actual_values = ? WHERE day = ?",
+                                   (*self._encode(pd.Series(actuals, dtype=object)), day))
+            if updated: self._bump_revision()
+        return updated
+
+    def _select(self, where, params, columns):
+        """Dias que atendem `where` -> DataFrame com 'event_ts' e `columns`, em ordem de horário."""
+        selected = ", ".join(f'"{column}_codes", "{column}_values"' for column in columns)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT event_ts, {selected} FROM days WHERE {where} AND rows > 0 ORDER BY day", params).fetchall()
+        data = {"event_ts": np.concatenate([np.frombuffer(row[0], dtype=np.int64) for row in rows]) if rows else np.empty(0, np.int64)}
+        for i, column in enumerate(columns):
+            parts = [self._decode(row[1 + 2 * i], row[2 + 2 * i]) for row in rows]
+            data[column] = np.concatenate(parts) if parts else np.empty(0, dtype=object)
+        return pd.DataFrame(data)
+
+    def read(self, days, columns=None):
+        """Eventos de `days`, com 'event_ts' e 'datetime' (horário local sem fuso) já tipados; None se não houver nenhum."""
+        if not days: return None
+        events = self._select(f"day IN ({', '.join('?' * len(days))})", [f"{day:%Y-%m-%d}" for day in days], columns or self.columns)
+        if events.empty: return None
+        events['datetime'] = pd.to_datetime(events['event_ts'], unit='s', utc=True).dt.tz_convert(self.timezone).dt.tz_localize(None)
+        return events
+
+    def between(self, start_ts, end_ts, columns):
+        """Eventos com start_ts <= horário < end_ts: só os dias que cruzam o intervalo, recortados por busca binária."""
+        events = self._select("last_ts >= ? AND first_ts < ?", [start_ts, end_ts], columns)
+        event_ts = events['event_ts'].to_numpy()
+        lo, hi = np.searchsorted(event_ts, start_ts, 'left'), np.searchsorted(event_ts, end_ts, 'left')
+        return events.iloc[lo:hi].reset_index(drop=True)
+
+    def days(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT day FROM days ORDER BY day").fetchall()
+        return [datetime.strptime(day, "%Y-%m-%d").date() for (day,) in rows]
+
+    def drop_before(self, day):
+        with self._lock, self._conn:
+            if self._conn.execute("DELETE FROM days WHERE day < ?", (f"{day:%Y-%m-%d}",)).rowcount:
+                self._bump_revision()
+
+    def stats(self):
+        with self._lock:
+            count = self._conn.execute("SELECT COALESCE(SUM(rows), 0) FROM days").fetchone()[0]
+        return {"events": count, "updated_at": self._meta('updated_at'), "refreshed_at": self.refreshed_at(), "revision": self.revision()}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TranslationCache:
+    """Cache persistente (SQLite) de traduções, com despejo LRU limitado por tamanho."""
+    def __init__(self, db_path, max_entries=5000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (texto, idioma) -> tradução, do menos ao mais recente
+        self._dirty = set()
+        self._evicted = set()
+        self._conn = None
+        try:
+            self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " source TEXT NOT NULL, lang TEXT NOT NULL, translated TEXT NOT NULL,"
+                " last_used REAL NOT NULL, PRIMARY KEY (source, lang))"
+            )
+            rows = self._conn.execute(
+                "SELECT source, lang, translated FROM translations ORDER BY last_used DESC LIMIT ?",
+                (max_entries,)
+            ).fetchall()
+            for source, lang, translated in reversed(rows):
+                self._entries[(source, lang)] = translated
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao abrir cache de traduções {db_path}: {e}")
+            self._conn = None
+
+    def get(self, text, dest_language):
+        key = (text, dest_language)
+        with self._lock:
+            translated = self._entries.get(key)
+            if translated is None:
+                self.misses += 1
+                METRICS.inc("translation_cache_misses")
+                return None
+            self.hits += 1
+            METRICS.inc("translation_cache_hits")
+            self._entries.move_to_end(key)
+            self._dirty.add(key)
+            return translated
+
+    def peek(self, text, dest_language):
+        """Consulta sem contar acerto/falta nem renovar a entrada no LRU (ex.: conferir traduções já publicadas)."""
+        with self._lock:
+            return self._entries.get((text, dest_language))
+
+    def put(self, text, dest_language, translated):
+        key = (text, dest_language)
+        with self._lock:
+            self._entries[key] = translated
+            self._entries.move_to_end(key)
+            self._dirty.add(key)
+            self._evicted.discard(key)
+            while len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._dirty.discard(old_key)
+                self._evicted.add(old_key)
+
+    def flush(self):
+        """Grava em disco, numa única transação, as entradas usadas/alteradas desde o último flush."""
+        if self._conn is None: return
+        with self._lock:
+            now = t_sleep.time()
+            # A ordem do OrderedDict define o last_used, preservando a ordem LRU entre execuções
+            order = {key: i for i, key in enumerate(self._entries) if key in self._dirty}
+            rows = [(s, l, self._entries[(s, l)], now + order[(s, l)] * 1e-6) for (s, l) in order]
+            evicted = list(self._evicted)
+            self._dirty.clear()
+            self._evicted.clear()
+        if not rows and not evicted: return
+        try:
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)", rows)
+                self._conn.executemany("DELETE FROM translations WHERE source = ? AND lang = ?", evicted)
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao gravar cache de traduções: {e}")
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        if self._conn is None: return
+        self.flush()
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+
+
+class CalendarSource:
+    """Fonte de dados do calendário: devolve DataFrames no formato de investpy.news.economic_calendar."""
+    name = "base"
+
+    def fetch(self, countries, **kwargs):
+        raise NotImplementedError
+
+    @staticmethod
+    def slug(countries):
+        """Nome de arquivo para um conjunto de países (ex.: 'united_states+brazil')."""
+        return "+".join(country.replace(" ", "_") for country in countries)
+
+
+class InvestpySource(CalendarSource):
+    """Busca no investing.com via investpy, reaproveitando conexões HTTP (keep-alive) entre chamadas."""
+    name = "investpy"
+
+    def __init__(self, pool_size=8):
+        self.pool_size = pool_size
+        self.session = None
+        self._lock = threading.Lock()
+
+    def _ensure_session(self):
+        import investpy.news
+        with self._lock:
+            if self.session is not None: return
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            # investpy chama `requests.post` diretamente; apontá-lo para a sessão mantém o pool entre refreshes
+            investpy.news.requests = type("PooledRequests", (), {"post": staticmethod(session.post), "get": staticmethod(session.get)})
+            self.session = session
+
+    def fetch(self, countries, **kwargs):
+        self._ensure_session()
+        import investpy
+        return investpy.news.economic_calendar(countries=countries, **kwargs)
+
+
+class FixtureSource(CalendarSource):
+    """
+    Reproduz calendários gravados em disco (*.csv, em ordem de nome), para testes e carga offline.
+    Cada conjunto de países tem sua própria sequência: usa os arquivos gravados para ele
+    (sufixo _<países>.csv, ver RecordingSource) ou, se não houver, todos os arquivos filtrados por país.
+    """
+    name = "fixture"
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.files = sorted(self.directory.glob("*.csv"))
+        if not self.files:
+            raise FileNotFoundError(f"Nenhum calendário gravado em {self.directory}")
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, countries, **kwargs):
+        slug = self.slug(countries or [])
+        files = [f for f in self.files if f.stem.endswith(f"_{slug}")] or self.files
+        with self._lock:
+            position = self._next.get(slug, 0)
+            path = files[min(position, len(files) - 1)]  # o último arquivo se repete
+            self._next[slug] = position + 1
+        events = pd.read_csv(path, dtype=str, keep_default_na=False)
+        events = events.mask(events == '')  # vazio no CSV == None no investpy
+        if countries and 'zone' in events:
+            events = events[events['zone'].isin(countries)]
+        if kwargs.get("importances") and 'importance' in events:
+            events = events[events['importance'].isin(kwargs["importances"])]
+        if kwargs.get("from_date") and kwargs.get("to_date") and 'date' in events:
+            dates = pd.to_datetime(events['date'], format="%d/%m/%Y", errors='coerce')
+            start, end = (pd.to_datetime(kwargs[k], format="%d/%m/%Y") for k in ("from_date", "to_date"))
+            events = events[(dates >= start) & (dates <= end)]
+        return events.reset_index(drop=True)
+
+
+class RecordingSource(CalendarSource):
+    """Repassa as chamadas a outra fonte e grava cada resposta como fixture reutilizável pelo FixtureSource."""
+    def __init__(self, inner, directory):
+        self.inner = inner
+        self.name = f"{inner.name}+gravação"
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, countries, **kwargs):
+        events = self.inner.fetch(countries, **kwargs)
+        with self._lock:
+            self._count += 1
+            path = self.directory / f"{datetime.now():%Y%m%d_%H%M%S}_{self._count:03d}_{self.slug(countries or [])}.csv"
+        events.to_csv(path, index=False)
+        return events
+
+
+def create_calendar_source(argv=None):
+    """Escolhe a fonte de dados pela linha de comando: --fixture DIR (offline) e/ou --record DIR."""
+    argv = sys.argv if argv is None else argv
+    def arg_value(flag):
+        return argv[argv.index(flag) + 1] if flag in argv and argv.index(flag) + 1 < len(argv) else None
+    fixture_dir, record_dir = arg_value("--fixture"), arg_value("--record")
+    source = FixtureSource(fixture_dir) if fixture_dir else InvestpySource()
+    return RecordingSource(source, record_dir) if record_dir else source
+
+
+class RateLimiter:
+    """Espaça chamadas para no máximo `rate_per_second` por segundo, entre todas as threads."""
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        if not self.interval: return
+        with self._lock:
+            now = t_sleep.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            t_sleep.sleep(slot - now)
+
+
 class CalendarManager:
-    # (Código inalterado)
-    def __init__(self, config):
+    def __init__(self, config, source=None):
         self.config = config
-        self.translator = Translator()
+        self.source = source or InvestpySource()
+        self.translation_cache = TranslationCache(config.TRANSLATION_CACHE_FILE, config.TRANSLATION_CACHE_MAX_ENTRIES)
+        self.rate_limiter = RateLimiter(config.TRANSLATION_RATE_LIMIT)
+        self.event_db = EventDatabase(config.EVENT_DB_FILE, self.STATE_COLUMNS, config.TIMEZONE)
+        self.last_refresh_counts = None
+        self.last_failed_countries = []
+        self.last_fetched_days = 0
+        self._publish_lock = threading.RLock()  # serializa refresh completo e atualização de 'Real'
+        self._local = threading.local()
 
-    def translate_text(self, text, dest_language='pt'):
-        if not text or pd.isna(text): return ""
+    def _get_translator(self):
+        # Um Translator por thread: o cliente HTTP do googletrans não é compartilhado entre workers
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            translator = self._local.translator = timed_import("googletrans").Translator()
+        return translator
+
+    def _translate_remote(self, text, dest_language):
         try:
-            t_sleep.sleep(0.1) 
-            return self.translator.translate(text, dest=dest_language).text
+            self.rate_limiter.acquire()
+            METRICS.inc("translation_calls")
+            with METRICS.timer("translation_call_seconds"):
+                translated = self._get_translator().translate(text, dest=dest_language).text
         except Exception as e:
+            METRICS.inc("translation_errors")
             logging.error(f"Erro ao traduzir '{text}': {e}")
             return text
+        self.translation_cache.put(text, dest_language, translated)
+        return translated
+
+    def translate_text(self, text, dest_language='pt'):
+        if not text or pd.isna(text): return ""
+        cached = self.translation_cache.get(text, dest_language)
+        if cached is not None:
+            return cached
+        return self._translate_remote(text, dest_language)
+
+    def translate_series(self, texts, dest_language='pt'):
+        """Traduz uma Series deduplicando os textos e consultando o tradutor em paralelo só para o que não está em cache."""
+        texts = texts.fillna('').astype(str)
+        translations = {'': ''}
+        pending = []
+        for text in texts.unique():
+            if text in translations: continue
+            cached = self.translation_cache.get(text, dest_language)
+            if cached is None:
+                pending.append(text)
+            else:
+                translations[text] = cached
+        if pending:
+            logging.info(f"Traduzindo {len(pending)} nomes únicos (de {len(texts)} linhas)...")
+            workers = max(1, min(self.config.TRANSLATION_MAX_WORKERS, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="translate") as pool:
+                results = pool.map(lambda text: self._translate_remote(text, dest_language), pending)
+                translations.update(zip(pending, results))
+        return texts.map(translations)
+
+    COUNTRIES = ['united states', 'brazil']
+    SOURCE_COLUMNS = ['date', 'time', 'event', 'currency', 'importance', 'actual', 'forecast', 'previous']
+    RAW_COLUMNS = ['id', 'zone'] + SOURCE_COLUMNS
+    STATE_COLUMNS = ['event_id'] + SOURCE_COLUMNS + ['zone', 'event_pt']
+    PROFIT_COLUMNS = ['Data', 'Hora', 'Evento', 'Moeda', 'Importância', 'Previsão', 'Anterior', 'Real']
 
-    def download_calendar(self, importances, start_time, end_time):
+    @staticmethod
+    def _event_ids(events):
+        """Identidade estável do evento: o id do investing.com ou, na falta dele, um hash de data/hora/país/nome."""
+        fallback = pd.util.hash_pandas_object(
+            events.reindex(columns=['date', 'time', 'zone', 'event']).fillna('').astype(str), index=False
+        ).astype(str)
+        if 'id' not in events: return fallback
+        ids = events['id'].astype('string')
+        return ids.where(ids.notna() & (ids != ''), fallback).astype(str)
+
+    def _load_state(self, days=None):
+        """Eventos publicados dos dias pedidos (todos, se None); None se não houver nenhum."""
         try:
-            import investpy
-            logging.info("Baixando dados do calendário via investpy...")
-            events = investpy.news.economic_calendar(countries=['united states', 'brazil'])
+            return self.event_db.read(self.event_db.days() if days is None else days)
         except Exception as e:
-            logging.error(f"Falha ao baixar calendário: {e}")
-            return False, f"Erro ao baixar calendário: {e}"
+            logging.error(f"Erro ao ler estado do calendário, refazendo do zero: {e}")
+            return None
+
+    @staticmethod
+    def _days_of(dates):
+        """Datas ('dd/mm/aaaa') -> conjunto de dias."""
+        return set(pd.to_datetime(pd.Series(dates, dtype=object), format="%d/%m/%Y", errors='coerce').dropna().dt.date)
+
+    def _horizon(self):
+        today = datetime.now(self.config.TIMEZONE).date()
+        return [today + timedelta(days=i) for i in range(self.config.HORIZON_DAYS + 1)]
+
+    def _diff_against_state(self, events, state):
+        """
+        Classifica os eventos em novos/alterados/inalterados e reaproveita traduções de nomes que não mudaram.
+        Retorna também os dias afetados (None = todos), para regravar só essas partições.
+        """
+        current = events[self.SOURCE_COLUMNS].fillna('').astype(str)
+        if state is None or state.empty:
+            counts = {"added": len(events), "changed": 0, "unchanged": 0, "removed": 0}
+            return pd.Series(pd.NA, index=events.index, dtype=object), counts, None
+        previous = state.drop_duplicates('event_id').set_index('event_id')
+        known = events['event_id'].isin(previous.index).to_numpy()
+        aligned = previous.reindex(events['event_id'])
+        same = (current.to_numpy() == aligned[self.SOURCE_COLUMNS].fillna('').to_numpy()).all(axis=1) & known
+        same_name = (current['event'].to_numpy() == aligned['event'].to_numpy()) & known
+        reused_pt = pd.Series(aligned['event_pt'].to_numpy(), index=events.index).where(same_name)
+        # Tradução igual ao original costuma ser falha do tradutor (que devolve o texto em inglês): só é
+        # reaproveitada se estiver no cache; senão a linha volta a ser traduzida e seu dia é regravado
+        untranslated = reused_pt.notna() & (reused_pt == current['event'])
+        if untranslated.any():
+            confirmed = [name for name in current['event'][untranslated].unique() if self.translation_cache.peek(name, 'pt') is not None]
+            untranslated &= ~current['event'].isin(confirmed)
+            reused_pt = reused_pt.mask(untranslated)
+        removed = ~previous.index.isin(events['event_id'])
+        counts = {
+            "added": int((~known).sum()),
+            "changed": int((known & ~same).sum()),
+            "unchanged": int(same.sum()),
+            "removed": int(removed.sum()),
+        }
+        # Um evento alterado pode ter mudado de dia: o dia antigo também precisa ser regravado
+        touched = (self._days_of(current['date'][~same]) | self._days_of(aligned['date'][known & ~same])
+                   | self._days_of(previous.loc[removed, 'date']) | self._days_of(current['date'][untranslated]))
+        return reused_pt, counts, touched
 
+    def _fetch_events(self, countries=None, **kwargs):
+        return self.source.fetch(countries or self.COUNTRIES, **kwargs)
+
+    def _raw_partitions(self, country):
+        return DayPartitions(self.config.PARTITION_DIR / CalendarSource.slug([country]), self.RAW_COLUMNS)
+
+    @staticmethod
+    def _chunks(days, size):
+        """Agrupa dias consecutivos em blocos de no máximo `size` dias."""
+        chunks = []
+        for day in days:
+            if chunks and (day - chunks[-1][-1]).days == 1 and len(chunks[-1]) < size:
+                chunks[-1].append(day)
+            else:
+                chunks.append([day])
+        return chunks
+
+    def _stale_days(self, country, horizon, incremental):
+        """Dias do horizonte que podem ter mudado: hoje/amanhã, dias nunca buscados e dias com partição antiga."""
+        if not incremental: return list(horizon)
+        partitions = self._raw_partitions(country)
+        always_until = horizon[0] + timedelta(days=self.config.REFRESH_ALWAYS_DAYS)
+        stale = []
+        for day in horizon:
+            age = partitions.age(day)
+            if day < always_until or age is None or age > self.config.DAY_MAX_AGE_SECONDS:
+                stale.append(day)
+        return stale
+
+    def _fetch_chunk(self, country, days):
+        """Busca um país num bloco de dias e grava uma partição por dia (dias sem eventos ficam vazios)."""
+        # investpy exige to_date > from_date: um dia isolado é pedido junto com o seguinte e recortado
+        to_day = max(days[-1], days[0] + timedelta(days=1))
+        with METRICS.timer("chunk_fetch_seconds"):
+            events = self.source.fetch([country], from_date=f"{days[0]:%d/%m/%Y}", to_date=f"{to_day:%d/%m/%Y}")
+        event_days = pd.to_datetime(events['date'], format="%d/%m/%Y", errors='coerce').dt.date if 'date' in events else None
+        partitions = self._raw_partitions(country)
+        for day in days:
+            partitions.write(day, events[event_days == day] if event_days is not None else events)
+
+    def _fetch_horizon(self, countries, horizon, incremental=True):
+        """
+        Busca em paralelo (no máximo FETCH_MAX_WORKERS de uma vez) os blocos de dias que podem ter mudado,
+        por país, e junta as partições de todo o horizonte. Um bloco que falhar mantém as partições já salvas.
+        """
+        tasks = [(country, chunk) for country in countries
+                 for chunk in self._chunks(self._stale_days(country, horizon, incremental), self.config.FETCH_CHUNK_DAYS)]
+        failed, errors = set(), []
+        if tasks:
+            workers = max(1, min(self.config.FETCH_MAX_WORKERS, len(tasks)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as pool:
+                futures = {pool.submit(self._fetch_chunk, country, chunk): (country, chunk) for country, chunk in tasks}
+                for future, (country, chunk) in futures.items():
+                    try:
+                        future.result()
+                    except Exception as e:
+                        METRICS.inc("chunk_fetch_errors")
+                        failed.add(country)
+                        errors.append(f"{country}: {e}")
+                        logging.error(f"Falha ao buscar '{country}' de {chunk[0]:%d/%m} a {chunk[-1]:%d/%m}, mantendo os dados salvos desses dias: {e}")
+        self.last_failed_countries = [country for country in countries if country in failed]
+        self.last_fetched_days = sum(len(chunk) for _, chunk in tasks)
+        METRICS.set("days_fetched", self.last_fetched_days)
+
+        frames = []
+        for country in countries:
+            partitions = self._raw_partitions(country)
+            partitions.drop_before(horizon[0])
+            events = partitions.read(horizon)
+            if events is not None: frames.append(events.mask(events == ''))
+        if not frames:
+            raise RuntimeError("; ".join(errors) or "nenhum dado salvo para o horizonte")
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def _profit_frame(events):
+        """Converte eventos (colunas do investpy + 'datetime' e 'event_pt') para as colunas do CSV do Profit."""
+        return pd.DataFrame({
+            'Data': events['datetime'].dt.strftime('%d/%m/%Y'),
+            'Hora': events['datetime'].dt.strftime('%H:%M'),
+            'Evento': events['event_pt'],
+            'Moeda': events['currency'],
+            'Importância': events['importance'].str.capitalize(),
+            'Previsão': events['forecast'],
+            'Anterior': events['previous'],
+            'Real': events['actual'],
+        }, index=events.index)
+
+    def _publish(self, events, days):
+        """Substitui os eventos de `days` no banco (dias sem eventos ficam vazios) e regenera o CSV do Profit."""
+        with METRICS.timer("store_write_seconds"):
+            self.event_db.replace_days(days, events)
+        self._export_profit_csv()
+
+    def _export_profit_csv(self):
+        """CSV do Profit com os EXPORT_DAYS dias a partir de hoje, gerado a partir do banco."""
+        today = datetime.now(self.config.TIMEZONE).date()
+        with METRICS.timer("csv_write_seconds"):
+            events = self.event_db.read([today + timedelta(days=i) for i in range(self.config.EXPORT_DAYS)])
+            if events is None:
+                events = self._parse_datetimes(pd.DataFrame(columns=self.STATE_COLUMNS, dtype=str))
+            atomic_write_csv(self._profit_frame(events), self.config.CSV_FILE, index=False, encoding="utf-8-sig")
+
+    def _export_is_current(self):
+        if not self.config.CSV_FILE.exists(): return False
+        exported = datetime.fromtimestamp(self.config.CSV_FILE.stat().st_mtime, self.config.TIMEZONE).date()
+        return exported == datetime.now(self.config.TIMEZONE).date()
+
+    def update_actuals(self, fresh_events):
+        """Preenche o 'Real' dos eventos publicados que ainda não o tinham. Retorna os ids atualizados."""
+        fresh = fresh_events.assign(event_id=self._event_ids(fresh_events))
+        fresh = fresh[fresh['actual'].notna() & (fresh['actual'].astype(str) != '')]
+        if fresh.empty: return set()
+        actual_by_id = fresh.drop_duplicates('event_id').set_index('event_id')['actual'].astype(str)
+        with self._publish_lock:
+            try:
+                updated = self.event_db.update_actuals(actual_by_id)
+                if not updated: return set()
+                self._export_profit_csv()
+            except (IOError, sqlite3.Error) as e:
+                logging.error(f"Falha ao salvar valores 'Real': {e}")
+                return set()
+        logging.info(f"Valor 'Real' publicado para {len(updated)} evento(s).")
+        return updated
+
+    @staticmethod
+    def _parse_datetimes(events):
         events['datetime'] = pd.to_datetime(events['date'] + ' ' + events['time'], dayfirst=True, errors='coerce')
-        
-        filtered_events = events[
+        return events
+
+    @staticmethod
+    def _filter_events(events, importances, start_time, end_time):
+        return events[
             events["importance"].isin(importances) &
             (events['datetime'].dt.time >= start_time) &
             (events['datetime'].dt.time <= end_time)
         ].copy()
 
+    def download_calendar(self, importances, start_time, end_time, incremental=True, countries=None):
+        countries = countries or self.COUNTRIES
+        horizon = self._horizon()
+        try:
+            logging.info(f"Baixando dados do calendário via {self.source.name} ({', '.join(countries)}; {horizon[0]:%d/%m} a {horizon[-1]:%d/%m})...")
+            with METRICS.timer("download_seconds"):
+                events = self._fetch_horizon(countries, horizon, incremental)
+        except Exception as e:
+            METRICS.inc("download_errors")
+            logging.error(f"Falha ao baixar calendário: {e}")
+            return False, f"Erro ao baixar calendário: {e}"
+
+        events = self._parse_datetimes(events)
+        filtered_events = self._filter_events(events, importances, start_time, end_time)
+        METRICS.set("rows_downloaded", len(events))
+        METRICS.set("rows_filtered", len(filtered_events))
+
         if filtered_events.empty:
             msg = "Nenhum evento encontrado com os filtros selecionados."
             logging.warning(msg)
             return False, msg
 
-        logging.info("Iniciando tradução dos nomes dos eventos...")
-        filtered_events['event_pt'] = filtered_events['event'].fillna('').apply(self.translate_text)
-        logging.info("Tradução concluída.")
-
-        filtered_events['Data'] = filtered_events['datetime'].dt.strftime('%d/%m/%Y')
-        filtered_events['Hora'] = filtered_events['datetime'].dt.strftime('%H:%M')
-        filtered_events['Evento'] = filtered_events['event_pt'] 
-        filtered_events['Moeda'] = filtered_events['currency']
-        filtered_events['Importância'] = filtered_events['importance'].str.capitalize()
-        filtered_events['Previsão'] = filtered_events['forecast']
-        filtered_events['Anterior'] = filtered_events['previous']
-        filtered_events['Real'] = filtered_events['actual']
-        
-        profit_columns = ['Data', 'Hora', 'Evento', 'Moeda', 'Importância', 'Previsão', 'Anterior', 'Real']
-        
+        with self._publish_lock:
+            success, message = self._refresh_published(filtered_events, incremental, horizon)
+            if success and not self.last_failed_countries:
+                self.event_db.mark_refreshed()  # idade dos dados servidos = agora - refreshed_at
+        if self.last_failed_countries:
+            message += f" Sem dados novos de: {', '.join(self.last_failed_countries)}."
+        return success, message
+
+    def _refresh_published(self, filtered_events, incremental, horizon):
+        filtered_events['event_id'] = self._event_ids(filtered_events)
+        self.event_db.drop_before(horizon[0])
+        state = self._load_state(horizon) if incremental else None
+        filtered_events['event_pt'], counts, touched_days = self._diff_against_state(filtered_events, state)
+        self.last_refresh_counts = counts
+        counts_msg = f"{counts['added']} novos, {counts['changed']} alterados, {counts['unchanged']} inalterados, {counts['removed']} removidos"
+        logging.info(f"Diferença em relação ao último refresh: {counts_msg}.")
+        unchanged = counts['added'] == counts['changed'] == counts['removed'] == 0 and filtered_events['event_pt'].notna().all()
+        if state is not None and unchanged and self._export_is_current():
+            return True, f"Calendário já estava atualizado ({counts_msg})."
+        days = horizon if touched_days is None else sorted(touched_days)
+
+        needs_translation = filtered_events['event_pt'].isna()
+        if needs_translation.any():
+            logging.info("Iniciando tradução dos nomes dos eventos...")
+            filtered_events.loc[needs_translation, 'event_pt'] = self.translate_series(filtered_events.loc[needs_translation, 'event'])
+            self.translation_cache.flush()
+            cache_stats = self.translation_cache.stats()
+            logging.info(f"Tradução concluída (cache: {cache_stats['hits']} acertos, {cache_stats['misses']} faltas).")
+
         try:
-            filtered_events[profit_columns].to_csv(self.config.CSV_FILE, index=False, encoding="utf-8-sig")
-            logging.info(f"Calendário salvo com sucesso em: {self.config.CSV_FILE}")
-            return True, f"CSV atualizado com sucesso!"
-        except IOError as e:
+            self._publish(filtered_events, days)
+            logging.info(f"Calendário salvo com sucesso em: {self.config.CSV_FILE} ({len(days)} dia(s) regravado(s)).")
+            return True, f"CSV atualizado com sucesso! ({counts_msg})"
+        except (IOError, sqlite3.Error) as e:
             msg = f"Falha ao salvar o arquivo CSV: {e}"
             logging.error(msg)
             return False, msg
 
 
-class AlertService:
-    # (Código inalterado)
-    def __init__(self, config, app_instance):
+class ActualsTracker:
+    """Busca o valor 'Real' logo após cada divulgação (ex.: +30 s, +2 min, +5 min) e atualiza só essas linhas."""
+    def __init__(self, config, calendar_manager):
         self.config = config
-        self.app = app_instance
+        self.calendar_manager = calendar_manager
+        self.offsets = tuple(sorted(config.ACTUALS_POLL_OFFSETS))
         self.active = threading.Event()
-        self.dispatched_alerts = set()
-        pygame.mixer.init()
+        self._wakeup = threading.Event()
+        self._attempts = {}  # event_id -> quantas buscas já foram feitas
+        self.fetches = 0
 
     def start(self):
         if self.active.is_set(): return
-        logging.info("Iniciando serviço de alertas.")
+        logging.info("Iniciando acompanhamento de valores divulgados.")
         self.active.set()
-        threading.Thread(target=self._alert_loop, daemon=True).start()
+        threading.Thread(target=self._loop, daemon=True).start()
 
     def stop(self):
-        logging.info("Parando serviço de alertas.")
         self.active.clear()
+        self._wakeup.set()
 
-    def _alert_loop(self):
+    def notify_calendar_changed(self):
+        self._wakeup.set()
+
+    def _loop(self):
         while self.active.is_set():
-            self.check_events()
-            t_sleep.sleep(15)
+            self._wakeup.clear()
+            delay = self.poll_due()
+            self._wakeup.wait(delay)
+
+    def _pending_releases(self):
+        """Eventos publicados ainda sem 'Real', com o horário da divulgação em epoch."""
+        state = self.calendar_manager._load_state([datetime.now(self.config.TIMEZONE).date()])
+        if state is None or state.empty: return None
+        pending = state[state['actual'] == '']
+        return pending.assign(release_ts=pending['event_ts'])
+
+    def poll_due(self):
+        """Faz uma busca se alguma divulgação chegou ao próximo ponto de verificação; retorna segundos até o próximo."""
+        pending = self._pending_releases()
+        now = t_sleep.time()
+        # Sem pendências, só um refresh (que avisa via notify_calendar_changed) ou a virada do dia trazem novas
+        idle = min(self.config.ALERT_IDLE_FALLBACK_SECONDS, seconds_until_midnight(self.config.TIMEZONE, now))
+        # Só os pendentes de hoje interessam: eventos com 'Real' publicado ou de dias passados saem do contador
+        pending_ids = set() if pending is None else set(pending['event_id'])
+        self._attempts = {event_id: attempt for event_id, attempt in self._attempts.items() if event_id in pending_ids}
+        if not pending_ids: return idle
+        due, next_poll = [], None
+        for event_id, release_ts, zone, importance in zip(pending['event_id'], pending['release_ts'], pending['zone'], pending['importance']):
+            attempt = self._attempts.get(event_id, 0)
+            if attempt == 0 and now > release_ts + self.offsets[-1]:
+                # Divulgação antiga (ex.: app aberto depois): fica para o próximo refresh completo
+                self._attempts[event_id] = attempt = len(self.offsets)
+            if attempt >= len(self.offsets): continue
+            poll_at = release_ts + self.offsets[attempt]
+            if poll_at <= now:
+                due.append((event_id, zone, importance))
+            elif next_poll is None or poll_at < next_poll:
+                next_poll = poll_at
+
+        if due:
+            countries = sorted({zone for _, zone, _ in due if zone}) or None
+            importances = sorted({importance for _, _, importance in due if importance}) or None
+            try:
+                self.fetches += 1
+                fresh = self.calendar_manager._fetch_events(countries=countries, importances=importances)
+                updated = self.calendar_manager.update_actuals(fresh)
+            except Exception as e:
+                logging.error(f"Falha ao buscar valores divulgados: {e}")
+                updated = set()
+            for event_id, _, _ in due:
+                # Com o valor publicado o evento sai da lista de pendentes; senão tenta no próximo offset
+                self._attempts[event_id] = len(self.offsets) if event_id in updated else self._attempts.get(event_id, 0) + 1
+            return 0.0  # recalcula o próximo ponto de verificação com as tentativas atualizadas
+        return idle if next_poll is None else min(idle, max(0.0, next_poll - now))
+
+
+class EventRecord:
+    """Um evento do caminho de alertas, criado sob demanda a partir do EventStore."""
+    __slots__ = ("event_ts", "name", "currency", "importance", "key")
+
+    def __init__(self, event_ts, name, currency, importance, key):
+        self.event_ts = event_ts
+        self.name = name
+        self.currency = currency
+        self.importance = importance
+        self.key = key  # identidade compacta (hash de horário + id do evento), usada na deduplicação
+
+    def to_alert(self, timezone):
+        return {
+            "evento": self.name, "moeda": self.currency, "importancia": self.importance,
+            "hora": datetime.fromtimestamp(self.event_ts, timezone).strftime('%H:%M'),
+            "key": f"{self.key:016x}", "event_ts": self.event_ts,
+        }
+
+
+class EventStore:
+    """Armazenamento colunar compacto: horários em int64, moeda/importância/nome como códigos inteiros."""
+    IMPORTANCE_LEVELS = ("", "Low", "Medium", "High")  # código = posição na tupla
+
+    def __init__(self, times=None, importance=None, currency=None, names=None, keys=None, currency_table=(), name_table=()):
+        self.times = times if times is not None else np.empty(0, dtype=np.int64)  # epoch (s), crescente
+        self.keys = keys if keys is not None else np.empty(0, dtype=np.uint64)
+        self.importance = importance if importance is not None else np.empty(0, dtype=np.int8)
+        self.currency = currency if currency is not None else np.empty(0, dtype=np.int16)
+        self.names = names if names is not None else np.empty(0, dtype=np.int32)
+        self.currency_table = list(currency_table)
+        self.name_table = list(name_table)
+
+    @staticmethod
+    def identity_keys(event_ts, event_ids):
+        """Hash de 64 bits de (horário, id do evento), estável entre execuções: um evento adiado ganha outra identidade."""
+        frame = pd.DataFrame({"ts": np.asarray(event_ts, dtype=np.int64), "id": np.asarray(event_ids, dtype=object).astype(str)})
+        return pd.util.hash_pandas_object(frame, index=False).to_numpy(np.uint64)
+
+    @classmethod
+    def from_columns(cls, event_ts, names, currencies, importances, event_ids):
+        """Monta o store a partir de colunas alinhadas (ordena por horário e interna os textos uma única vez)."""
+        event_ts = np.asarray(event_ts, dtype=np.int64)
+        order = np.argsort(event_ts, kind='stable')
+        keys = cls.identity_keys(event_ts, event_ids)[order]
+        name_codes, name_uniques = pd.factorize(pd.Series(names, dtype=object).iloc[order])
+        currency_codes, currency_uniques = pd.factorize(pd.Series(currencies, dtype=object).iloc[order])
+        importance_codes = {level: code for code, level in enumerate(cls.IMPORTANCE_LEVELS)}
+        return cls(
+            times=event_ts[order],
+            importance=np.fromiter(
+                (importance_codes.get(str(level).capitalize(), 0) for level in np.asarray(importances, dtype=object)[order]),
+                dtype=np.int8, count=len(order)),
+            currency=currency_codes.astype(np.int16),
+            names=name_codes.astype(np.int32),
+            keys=keys,
+            currency_table=[sys.intern(str(c)) for c in currency_uniques],
+            name_table=[sys.intern(str(n)) for n in name_uniques],
+        )
+
+    def __len__(self):
+        return len(self.times)
+
+    def record(self, i):
+        return EventRecord(
+            int(self.times[i]), self.name_table[self.names[i]],
+            self.currency_table[self.currency[i]], self.IMPORTANCE_LEVELS[self.importance[i]], int(self.keys[i]))
+
+    def query(self, after_ts, until_ts, importances=None):
+        """Eventos com after_ts < horário <= until_ts, opcionalmente só das importâncias dadas."""
+        lo = int(np.searchsorted(self.times, after_ts, side='right'))
+        hi = int(np.searchsorted(self.times, until_ts, side='right'))
+        indexes = range(lo, hi)
+        if importances is not None:
+            codes = [self.IMPORTANCE_LEVELS.index(level) for level in importances if level in self.IMPORTANCE_LEVELS]
+            indexes = lo + np.flatnonzero(np.isin(self.importance[lo:hi], codes))
+        return [self.record(i) for i in indexes]
+
+    def next_time_after(self, ts):
+        i = int(np.searchsorted(self.times, ts, side='right'))
+        return int(self.times[i]) if i < len(self.times) else None
+
+    def memory_usage(self):
+        """Bytes ocupados pelas colunas e pelas tabelas de textos internados."""
+        arrays = self.times.nbytes + self.importance.nbytes + self.currency.nbytes + self.names.nbytes + self.keys.nbytes
+        tables = sum(sys.getsizeof(s) for s in self.name_table) + sum(sys.getsizeof(s) for s in self.currency_table)
+        return arrays + tables + sys.getsizeof(self.name_table) + sys.getsizeof(self.currency_table)
+
+
+class EventIndex:
+    """
+    Índice em memória dos eventos de hoje e amanhã (amanhã cobre os alertas logo após a meia-noite),
+    ordenado por horário e recarregado só quando o banco muda ou o dia vira.
+    """
+    def __init__(self, event_db, timezone):
+        self.event_db = event_db
+        self.timezone = timezone
+        self.store = EventStore()
+        self.reload_count = 0
+        self.reload_durations = deque(maxlen=50)
+        self.loaded_at = 0.0
+        self.refreshed_at = None  # última atualização completa do calendário servido
+        self._signature = None
+
+    def refresh(self):
+        """Recarrega o índice se o banco mudou ou o dia virou. Retorna True quando houve recarga."""
+        today = datetime.now(self.timezone).date()
+        try:
+            signature = (today, self.event_db.revision())
+            self.refreshed_at = self.event_db.refreshed_at()
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao consultar calendário para alertas: {e}")
+            return False
+        if signature == self._signature: return False
+
+        started = t_sleep.perf_counter()
+        start_ts, end_ts = (int(self.timezone.localize(datetime.combine(today + timedelta(days=i), time())).timestamp()) for i in (0, 2))
+        try:
+            df = self.event_db.between(start_ts, end_ts, ['event_id', 'event_pt', 'currency', 'importance'])
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao ler calendário para alertas: {e}")
+            return False
+
+        self.store = EventStore.from_columns(df['event_ts'].to_numpy(np.int64), df['event_pt'], df['currency'], df['importance'], df['event_id'])
+        self._signature = signature
+        self.loaded_at = t_sleep.time()
+        self.reload_count += 1
+        self.reload_durations.append(t_sleep.perf_counter() - started)
+        return True
+
+    def events_in_window(self, now_ts, lead_seconds):
+        """Eventos com now < horário <= now + lead, isto é, dentro da janela de alerta."""
+        return self.store.query(now_ts, now_ts + lead_seconds)
+
+    def next_alert_deadline(self, now_ts, lead_seconds):
+        """Próximo instante (epoch) em que um evento entra na janela de alerta, ou None."""
+        next_time = self.store.next_time_after(now_ts + lead_seconds)
+        return next_time - lead_seconds if next_time is not None else None
+
+    def data_age(self, now=None):
+        """Segundos desde a última atualização completa do calendário servido (None se nunca houve)."""
+        if self.refreshed_at is None: return None
+        return max(0.0, (now or t_sleep.time()) - self.refreshed_at)
+
+    def stats(self):
+        last = self.reload_durations[-1] if self.reload_durations else 0.0
+        return {"events": len(self.store), "reloads": self.reload_count, "last_reload_ms": last * 1000,
+                "memory_bytes": self.store.memory_usage(), "data_age_seconds": self.data_age()}
+
+
+class SoundBank:
+    """
+    Sons de alerta decodificados uma única vez em pygame.mixer.Sound (sob demanda) e recarregados
+    só se o arquivo mudar. Cada alerta toca num canal livre, sem cortar o som anterior.
+    """
+    def __init__(self, sound_dir, channels=8, buffer=512):
+        self.sound_dir = Path(sound_dir)
+        self.channels = channels
+        self.buffer = buffer
+        self.start_latencies = deque(maxlen=50)
+        self._pygame = None
+        self._sounds = {}  # nome do arquivo -> ((mtime_ns, tamanho), Sound)
+        self._lock = threading.Lock()
+
+    def _get_pygame(self):
+        # pygame (e o mixer de áudio) só é carregado no primeiro uso
+        if self._pygame is None:
+            pygame = timed_import("pygame")
+            pygame.mixer.init(buffer=self.buffer)
+            pygame.mixer.set_num_channels(self.channels)
+            self._pygame = pygame
+        return self._pygame
+
+    def get(self, name):
+        """Devolve o Sound já decodificado, (re)carregando do disco só na primeira vez ou se o arquivo mudou."""
+        path = self.sound_dir / name
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._sounds.get(name)
+            if cached and cached[0] == signature:
+                return cached[1]
+            pygame = self._get_pygame()
+            started = t_sleep.perf_counter()
+            sound = pygame.mixer.Sound(str(path))
+            self._sounds[name] = (signature, sound)
+        logging.info(f"Som '{name}' decodificado em {(t_sleep.perf_counter() - started) * 1000:.0f} ms.")
+        return sound
+
+    def preload(self, names=None):
+        """Decodifica os sons dados ou, com names=None, todos os MP3 de sound_dir."""
+        for name in (names if names is not None else [f.name for f in self.sound_dir.glob("*.mp3")]):
+            try:
+                self.get(name)
+            except Exception as e:
+                logging.error(f"Erro ao pré-carregar som {name}: {e}")
+
+    def play(self, name):
+        """Toca o som num canal livre e retorna a latência estimada (gatilho até o início do áudio), em segundos."""
+        triggered = t_sleep.perf_counter()
+        sound = self.get(name)
+        channel = self._pygame.mixer.find_channel(True)  # com todos ocupados, reaproveita o mais antigo
+        channel.play(sound)
+        frequency = (self._pygame.mixer.get_init() or (44100,))[0]
+        latency = (t_sleep.perf_counter() - triggered) + self.buffer / frequency
+        self.start_latencies.append(latency)
+        METRICS.observe("sound_start_seconds", latency)
+        return latency
+
+
+class AlertDedupStore:
+    """
+    Alertas já entregues, pela identidade compacta do evento (EventRecord.key). Em memória ficam só os
+    de eventos ainda por acontecer; no disco, um arquivo só de acréscimo com 16 bytes por alerta,
+    reescrito enxuto quando os registros vencidos passam a dominar. Sobrevive a reinícios do app.
+    """
+    RECORD = struct.Struct("<Qq")  # chave, horário do evento (epoch)
+    COMPACT_MIN_RECORDS = 256
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._entries = {}  # chave -> horário do evento
+        self._file_records = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logging.error(f"Erro ao ler alertas já entregues ({self.path}): {e}")
+            return
+        size = self.RECORD.size
+        self._file_records = len(data) // size  # um registro incompleto no fim (queda no meio da escrita) é ignorado
+        now = t_sleep.time()
+        for key, event_ts in self.RECORD.iter_unpack(data[:self._file_records * size]):
+            if event_ts > now:
+                self._entries[key] = event_ts
+        self._compact_if_needed()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add_many(self, items):
+        """Registra [(chave, horário do evento)] e grava no disco antes de retornar."""
+        items = [(key, event_ts) for key, event_ts in items if key not in self._entries]
+        if not items: return
+        with self._lock:
+            self._entries.update(items)
+            try:
+                with open(self.path, 'ab') as f:
+                    f.write(b"".join(self.RECORD.pack(key, event_ts) for key, event_ts in items))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._file_records += len(items)
+            except OSError as e:
+                logging.error(f"Erro ao gravar alertas já entregues ({self.path}): {e}")
+
+    def prune(self, now):
+        """Descarta os alertas de eventos que já passaram (não podem mais ser disparados)."""
+        expired = [key for key, event_ts in self._entries.items() if event_ts <= now]
+        if not expired: return
+        with self._lock:
+            for key in expired:
+                del self._entries[key]
+            self._compact_if_needed()
+
+    def _compact_if_needed(self):
+        if self._file_records < max(self.COMPACT_MIN_RECORDS, 2 * len(self._entries)): return
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(b"".join(self.RECORD.pack(key, event_ts) for key, event_ts in self._entries.items()))
+            os.replace(tmp_path, self.path)
+            self._file_records = len(self._entries)
+        except OSError as e:
+            logging.error(f"Erro ao compactar alertas já entregues ({self.path}): {e}")
+
+
+class Notifier:
+    """
+    Destino dos alertas disparados pelo AlertService. Popups, som, console, arquivo JSON-lines e a
+    API local são notificadores; o serviço de alertas não depende de nenhum deles (nem do Tk).
+    """
+    def start(self):
+        """Chamado quando o serviço de alertas começa (ex.: pré-carregar recursos)."""
+
+    def notify(self, alert_data):
+        raise NotImplementedError
 
-    def play_sound(self):
-        sound_file_name = self.app.get_selected_sound()
+    def close(self):
+        pass
+
+
+class SoundNotifier(Notifier):
+    """
+    Toca o som selecionado ou, com `by_importance`, o som da maior importância do alerta (IMPORTANCE_SOUNDS),
+    se o arquivo existir. `sound_name` e `by_importance` podem ser valores ou funções lidas a cada alerta.
+    """
+    def __init__(self, config, sound_name, by_importance=False):
+        self.config = config
+        self.sound_name = sound_name if callable(sound_name) else (lambda: sound_name)
+        self.by_importance = by_importance if callable(by_importance) else (lambda: by_importance)
+        self.sound_bank = SoundBank(config.SOUND_DIR, config.SOUND_CHANNELS, config.SOUND_BUFFER)
+
+    def start(self):
+        # Decodifica todos os sons de SOUND_DIR (o selecionado primeiro): nem o primeiro alerta
+        # nem uma troca de som na janela pagam a decodificação do MP3
+        selected = self.sound_name()
+        names = sorted(f.name for f in self.config.SOUND_DIR.glob("*.mp3"))
+        if selected in names:
+            names.remove(selected)
+            names.insert(0, selected)
+        self.sound_bank.preload(names)
+
+    def notify(self, alert_data):
+        self.play(alert_data.get("importancia"))
+
+    def sound_for(self, importance=None):
+        """Arquivo a tocar para um alerta da importância dada (None = o som selecionado)."""
+        if importance and self.by_importance():
+            name = self.config.IMPORTANCE_SOUNDS.get(importance)
+            if name and (self.config.SOUND_DIR / name).exists(): return name
+        return self.sound_name()
+
+    def play(self, importance=None):
+        sound_file_name = self.sound_for(importance)
         if not sound_file_name: return
         path = self.config.SOUND_DIR / sound_file_name
         if path.exists():
             try:
-                pygame.mixer.music.load(path)
-                pygame.mixer.music.play()
-                logging.info(f"Tocando som de alerta: {sound_file_name}")
-            except pygame.error as e:
+                latency = self.sound_bank.play(sound_file_name)
+                level = f" [{importance}]" if importance else ""
+                logging.info(f"Tocando som de alerta{level}: {sound_file_name} (início em {latency * 1000:.0f} ms)")
+            except Exception as e:
                 logging.error(f"Erro ao tocar som {path}: {e}")
         else:
             logging.error(f"Arquivo de som '{sound_file_name}' não encontrado.")
 
-    def check_events(self):
-        if not self.config.CSV_FILE.exists(): return
+
+def _json_default(value):
+    """Converte escalares numpy (ex.: horários int64 do EventStore) ao serializar em JSON."""
+    if isinstance(value, np.generic): return value.item()
+    raise TypeError(f"{type(value).__name__} não é serializável em JSON")
+
+
+class ConsoleNotifier(Notifier):
+    """Escreve cada alerta numa linha do console: texto legível ou, com json_lines=True, um objeto JSON por linha."""
+    def __init__(self, config, stream=None, json_lines=False):
+        self.config = config
+        self.stream = stream
+        self.json_lines = json_lines
+        self._lock = threading.Lock()
+
+    def notify(self, alert_data):
+        stream = self.stream or sys.stdout
+        if stream is None: return  # executável sem console
+        if self.json_lines:
+            line = json.dumps(alert_data, ensure_ascii=False, default=_json_default)
+        else:
+            stars = self.config.IMPORTANCE_STARS.get(alert_data['importancia'], "")
+            extra = len(alert_data.get("eventos", [])) - 1
+            line = f"[{alert_data['hora']}] {stars} {alert_data['moeda']} - {alert_data['evento']}"
+            if extra > 0: line += f" (+{extra} eventos)"
+        with self._lock:
+            print(line, file=stream, flush=True)
+
+
+class JsonLinesNotifier(Notifier):
+    """Acrescenta cada alerta como uma linha JSON num arquivo, para outras ferramentas acompanharem (tail -f)."""
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def notify(self, alert_data):
+        line = json.dumps(dict(alert_data, disparado_em=round(t_sleep.time(), 3)), ensure_ascii=False, default=_json_default)
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+
+
+class AlertService:
+    def __init__(self, config, notifiers=()):
+        self.config = config
+        self.notifiers = list(notifiers)  # chamados em ordem a cada alerta (o som antes do popup)
+        self.event_index = EventIndex(EventDatabase(config.EVENT_DB_FILE, CalendarManager.STATE_COLUMNS, config.TIMEZONE), config.TIMEZONE)
+        self.active = threading.Event()
+        self._wakeup = threading.Event()
+        self.dispatched_alerts = AlertDedupStore(config.ALERT_DEDUP_FILE)
+        self.wakeups = 0
+        self.alert_latencies = deque(maxlen=200)
+        self.coalesced_alerts = 0
+
+    def start(self):
+        if self.active.is_set(): return
+        logging.info("Iniciando serviço de alertas.")
+        self.active.set()
+        threading.Thread(target=self._alert_loop, daemon=True).start()
+
+    def stop(self):
+        logging.info("Parando serviço de alertas.")
+        self.active.clear()
+        self._wakeup.set()
+
+    def notify_calendar_changed(self):
+        """Acorda o loop de alertas para recarregar o calendário e recalcular o próximo prazo."""
+        self._wakeup.set()
+
+    def _alert_loop(self):
+        # Dorme exatamente até o próximo prazo (horário do evento - 5 min); stop() e
+        # notify_calendar_changed() interrompem a espera.
+        delay = self.check_events()  # o último calendário salvo já vale, sem esperar a rede
+        ready = t_sleep.perf_counter() - _PROCESS_START
+        METRICS.set("alerts_ready_seconds", ready)
+        age = self.event_index.data_age()
+        age_text = f"calendário atualizado há {age / 60:.0f} min" if age is not None else "sem calendário salvo"
+        logging.info(f"Alertas ativos {ready * 1000:.0f} ms após o início do processo ({age_text}).")
+        for notifier in self.notifiers:
+            try:
+                notifier.start()
+            except Exception as e:
+                logging.error(f"Erro ao preparar o notificador {type(notifier).__name__}: {e}")
+        self._wakeup.wait(delay)
+        self.wakeups += 1
+        while self.active.is_set():
+            self._wakeup.clear()
+            delay = self.check_events()
+            self._wakeup.wait(delay)
+            self.wakeups += 1
+
+    def check_events(self, now=None):
+        """Dispara os alertas devidos e retorna quantos segundos dormir até o próximo prazo."""
+        with METRICS.timer("alert_check_seconds"):
+            return self._check_events(now)
+
+    def _check_events(self, now):
+        if self.event_index.refresh():
+            stats = self.event_index.stats()
+            logging.info(f"Calendário de alertas recarregado: {stats['events']} eventos em {stats['last_reload_ms']:.1f} ms (recarga nº {stats['reloads']}).")
+        lead = self.config.ALERT_LEAD_SECONDS
+        window = self.config.ALERT_COALESCE_SECONDS
+        fixed_clock = now is not None
+        now = now if fixed_clock else t_sleep.time()
+        self.dispatched_alerts.prune(now)
+        age = self.event_index.data_age(now)
+        if age is not None: METRICS.set("calendar_age_seconds", age)
+        # Eventos que ainda vão entrar na janela dentro do intervalo de agrupamento são antecipados
+        # para sair junto com o grupo, em vez de gerar um segundo som e um segundo popup
+        candidates = [
+            record for record in self.event_index.events_in_window(now, lead + window)
+            if record.key not in self.dispatched_alerts
+        ]
+        for group in self._coalesce(candidates, window):
+            if group[0].event_ts > now + lead: continue  # grupo ainda sem nenhum evento devido
+            self._dispatch_group(group, lead)
+
+        now = now if fixed_clock else t_sleep.time()
+        # Dorme até o próximo prazo ou a virada do dia (o índice cobre hoje e amanhã); calendário novo
+        # chega por notify_calendar_changed(), e o fallback longo só cobre gravações feitas por fora
+        delay = min(self.config.ALERT_IDLE_FALLBACK_SECONDS, seconds_until_midnight(self.config.TIMEZONE, now))
+        deadline = self.event_index.next_alert_deadline(now, lead)
+        if deadline is not None:
+            delay = min(delay, max(0.0, deadline - now))
+        return delay
+
+    @staticmethod
+    def _coalesce(records, window):
+        """Agrupa eventos cujo horário fica a até `window` segundos do primeiro do grupo."""
+        groups = []
+        for record in sorted(records, key=lambda r: r.event_ts):
+            if groups and record.event_ts - groups[-1][0].event_ts <= window:
+                groups[-1].append(record)
+            else:
+                groups.append([record])
+        return groups
+
+    def _group_alert(self, group):
+        """Um único alerta para o grupo: importância e cabeçalho do evento mais importante, lista ordenada por importância."""
+        group = sorted(group, key=lambda r: (-EventStore.IMPORTANCE_LEVELS.index(r.importance), r.event_ts))
+        alerts = [record.to_alert(self.config.TIMEZONE) for record in group]
+        alert_data = dict(alerts[0])
+        alert_data["eventos"] = alerts
+        return alert_data
+
+    def _dispatch_group(self, group, lead):
+        alert_data = self._group_alert(group)
+        for notifier in self.notifiers:
+            try:
+                notifier.notify(alert_data)
+            except Exception as e:
+                logging.error(f"Erro ao entregar alerta ao notificador {type(notifier).__name__}: {e}")
+        fired_at = t_sleep.time()
+        self.dispatched_alerts.add_many((record.key, record.event_ts) for record in group)
+        for record in group:
+            # Atraso = disparo - prazo pretendido (ou o momento da carga, se o evento já chegou dentro da janela)
+            intended = max(record.event_ts - lead, self.event_index.loaded_at)
+            latency = max(0.0, fired_at - intended)
+            self.alert_latencies.append(latency)
+            METRICS.observe("alert_lateness_seconds", latency)
+        METRICS.inc("alerts_fired", len(group))
+        METRICS.inc("alert_notifications")
+        if len(group) > 1:
+            self.coalesced_alerts += len(group) - 1
+            METRICS.inc("alerts_coalesced", len(group) - 1)
+            logging.info(f"{len(group)} alertas agrupados numa única notificação ({alert_data['importancia']}): "
+                         f"{', '.join(a['evento'] for a in alert_data['eventos'])}.")
+        else:
+            logging.info(f"Alerta '{group[0].name}' disparado com atraso de {latency * 1000:.0f} ms.")
+
+    def stats(self):
+        latencies = list(self.alert_latencies)
+        return {
+            "wakeups": self.wakeups,
+            "alerts": len(latencies),
+            "coalesced": self.coalesced_alerts,
+            "dedup_entries": len(self.dispatched_alerts),
+            "latency_ms_max": max(latencies, default=0.0) * 1000,
+            "latency_ms_avg": (sum(latencies) / len(latencies) * 1000) if latencies else 0.0,
+        }
+
+
+class EventApiServer(Notifier):
+    """
+    Servidor HTTP local (asyncio, só 127.0.0.1) para outras ferramentas consultarem o calendário sem
+    ler o CSV e receberem os alertas por Server-Sent Events no mesmo instante do popup.
+
+      GET /events?from=&to=&importance=high,medium&currency=USD   eventos (from/to: epoch ou AAAA-MM-DDTHH:MM)
+      GET /events/stream                                          fluxo SSE com um `event: alert` por alerta
+      GET /health
+    """
+    HEARTBEAT_SECONDS = 15
+    QUEUE_SIZE = 100  # alertas pendentes por cliente; um cliente lento perde os mais antigos
+
+    def __init__(self, config, port):
+        self.config = config
+        self.port = int(port)
+        self.event_db = EventDatabase(config.EVENT_DB_FILE, CalendarManager.STATE_COLUMNS, config.TIMEZONE)
+        self._loop = None
+        self._server = None
+        self._subscribers = set()
+
+    def start(self):
+        """Abre o servidor (chamadas repetidas, ex.: pelo AlertService, não abrem de novo). Retorna False se a porta falhar."""
+        if self._loop is not None: return True
+        import asyncio
+        ready = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                self._server = loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", self.port))
+            except OSError as e:
+                logging.error(f"Não foi possível abrir a API local na porta {self.port}: {e}")
+                ready.set()
+                return
+            self._loop = loop
+            ready.set()
+            loop.run_forever()
+            loop.close()
+
+        threading.Thread(target=run, daemon=True, name="event-api").start()
+        ready.wait(5)
+        if self._loop is not None:
+            logging.info(f"API de eventos disponível em http://127.0.0.1:{self.port}/events (alertas em /events/stream)")
+        return self._loop is not None
+
+    def stop(self):
+        if self._loop is None: return
+        import asyncio
+        loop, self._loop = self._loop, None
         try:
-            df = pd.read_csv(self.config.CSV_FILE)
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=5)
         except Exception as e:
-            logging.error(f"Erro ao ler arquivo CSV para alertas: {e}")
-            return
-        now = datetime.now(self.config.TIMEZONE)
-        alerts_to_show = []
-        for _, row in df.iterrows():
-            alert_key = f"{row['Data']} {row['Hora']} {row['Evento']}"
-            if alert_key in self.dispatched_alerts: continue
+            logging.error(f"Erro ao encerrar a API local: {e!r}")
+        loop.call_soon_threadsafe(loop.stop)
+
+    def close(self):
+        self.stop()
+
+    async def _shutdown(self):
+        import asyncio
+        self._server.close()
+        for queue in self._subscribers:
+            if queue.full(): queue.get_nowait()
+            queue.put_nowait(None)  # encerra cada fluxo SSE aberto
+        for _ in range(50):
+            if not self._subscribers: break
+            await asyncio.sleep(0.01)
+
+    def notify(self, alert_data):
+        """Chamado pela thread de alertas: entrega o alerta a todos os clientes SSE conectados."""
+        if self._loop is None: return
+        payload = json.dumps(alert_data, ensure_ascii=False, default=_json_default)
+        self._loop.call_soon_threadsafe(self._broadcast, payload)
+
+    def _broadcast(self, payload):
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                METRICS.inc("api_alerts_dropped")
+            queue.put_nowait(payload)
+        METRICS.inc("api_alerts_pushed", len(self._subscribers))
+
+    async def _handle(self, reader, writer):
+        import asyncio
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 10)
+            while (await asyncio.wait_for(reader.readline(), 10)) not in (b"\r\n", b"\n", b""):
+                pass  # cabeçalhos ignorados
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            url = urllib.parse.urlsplit(target)
+            path = url.path.rstrip("/")
+            if method != "GET":
+                await self._respond(writer, 405, {"erro": "só GET é suportado"})
+            elif path == "/events/stream":
+                await self._stream(writer)
+            elif path == "/events":
+                params = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+                events = await asyncio.get_running_loop().run_in_executor(None, self.query, params)
+                await self._respond(writer, 200, events)
+            elif path == "/health":
+                await self._respond(writer, 200, {"status": "ok", "clientes": len(self._subscribers), **self.event_db.stats()})
+            else:
+                await self._respond(writer, 404, {"erro": "rota desconhecida"})
+        except ValueError as e:
+            await self._respond(writer, 400, {"erro": str(e)})
+        except (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, body):
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+        payload = json.dumps(body, ensure_ascii=False, default=_json_default).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {reasons[status]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("latin-1") + payload)
+        await writer.drain()
+
+    async def _stream(self, writer):
+        import asyncio
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._subscribers.add(queue)
+        METRICS.set("api_stream_clients", len(self._subscribers))
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream; charset=utf-8\r\n"
+                         b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n: conectado\n\n")
+            await writer.drain()
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), self.HEARTBEAT_SECONDS)
+                    if payload is None: return
+                    writer.write(f"event: alert\ndata: {payload}\n\n".encode("utf-8"))
+                except asyncio.TimeoutError:
+                    writer.write(b": ping\n\n")  # mantém a conexão e detecta clientes que saíram
+                await writer.drain()
+        finally:
+            self._subscribers.discard(queue)
+            METRICS.set("api_stream_clients", len(self._subscribers))
+
+    def _parse_time(self, value):
+        try:
+            return int(float(value))
+        except ValueError:
+            moment = datetime.fromisoformat(value)
+            if moment.tzinfo is None: moment = self.config.TIMEZONE.localize(moment)
+            return int(moment.timestamp())
+
+    def query(self, params):
+        """Eventos entre `from` e `to` (padrão: as próximas 24 h), filtrados por importância e moeda."""
+        start_ts = self._parse_time(params["from"]) if "from" in params else int(t_sleep.time())
+        end_ts = self._parse_time(params["to"]) if "to" in params else start_ts + 24 * 3600
+        events = self.event_db.between(start_ts, end_ts, CalendarManager.STATE_COLUMNS)
+        if params.get("importance"):
+            events = events[events['importance'].str.lower().isin(params["importance"].lower().split(","))]
+        if params.get("currency"):
+            events = events[events['currency'].str.upper().isin(params["currency"].upper().split(","))]
+        return events.to_dict("records")
+
+
+class RefreshScheduler:
+    """
+    Atualiza o calendário dentro do próprio monitor nos horários de REFRESH_TIMES ("HH:MM" ou "*:MM"),
+    com jitter e, após falhas, novas tentativas com backoff exponencial. Relógio (`clock`, devolve um
+    datetime com fuso) e gerador aleatório (`rng`) são injetáveis para testes.
+    """
+    MAX_SLEEP_SECONDS = 300  # reavalia o relógio de tempos em tempos (suspensão do PC, ajuste de hora)
+
+    def __init__(self, refresh, times, timezone, jitter_seconds=0, backoff_base=60, backoff_max=1800, clock=None, rng=None, timeout=None):
+        self.refresh = refresh  # função sem argumentos; retorna True se a atualização deu certo
+        self.timeout = timeout  # segundos; passado o prazo, conta como falha e a busca termina em segundo plano
+        self._worker = None
+        self._lock = threading.Lock()
+        # Protege next_run/failures/_triggered: mexem neles o agendador, trigger() e uma busca que terminou atrasada
+        self._state_lock = threading.Lock()
+        self._triggered = False  # pedido de trigger() ainda não atendido
+        self.times = self.parse_times(times)
+        self.timezone = timezone
+        self.jitter_seconds = jitter_seconds
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.clock = clock or (lambda: datetime.now(timezone))
+        self.rng = rng or random.Random()
+        self.active = threading.Event()
+        self._wakeup = threading.Event()
+        self.next_run = None
+        self.failures = 0
+        self.runs = 0
+        self.last_success = None
+
+    @staticmethod
+    def parse_times(times):
+        """Converte "HH:MM" e "*:MM" (toda hora) em pares (hora ou None, minuto)."""
+        parsed = []
+        for entry in times:
+            hour, minute = str(entry).strip().split(':')
+            hour = None if hour == '*' else int(hour)
+            minute = int(minute)
+            if not (0 <= minute < 60 and (hour is None or 0 <= hour < 24)):
+                raise ValueError(f"Horário de atualização inválido: {entry}")
+            parsed.append((hour, minute))
+        return list(dict.fromkeys(parsed))
+
+    def next_slot(self, after):
+        """Próximo horário agendado estritamente depois de `after` (sem jitter), ou None sem horários."""
+        slots = []
+        for hour, minute in self.times:
+            day, slot_hour = after.date(), after.hour if hour is None else hour
+            slot = self.timezone.localize(datetime.combine(day, time(slot_hour, minute)))
+            if slot <= after:
+                step = timedelta(hours=1) if hour is None else timedelta(days=1)
+                slot = self.timezone.localize(datetime.combine(day, time(slot_hour, minute)) + step)
+            slots.append(slot)
+        return min(slots, default=None)
+
+    def _schedule(self, now):
+        slot = self.next_slot(now)
+        self.next_run = slot + timedelta(seconds=self.rng.uniform(0, self.jitter_seconds)) if slot else None
+
+    def run_pending(self, now=None):
+        """Executa a atualização se chegou a hora; retorna os segundos até a próxima verificação."""
+        now = (now or self.clock()).astimezone(self.timezone)
+        with self._state_lock:
+            if self.next_run is None:
+                self._schedule(now)
+            due = self.next_run is not None and now >= self.next_run
+        if due:
+            self._run(now)
+        with self._state_lock:
+            next_run = self.next_run
+        if next_run is None: return self.MAX_SLEEP_SECONDS
+        return min(self.MAX_SLEEP_SECONDS, max(0.0, (next_run - now).total_seconds()))
+
+    def _call_refresh(self):
+        if self._worker is not None and self._worker.is_alive():
+            logging.warning("A atualização anterior ainda não terminou; nova tentativa adiada.")
+            return False
+        result = {}
+
+        def target():
             try:
-                event_time_str = f"{row['Data']} {row['Hora']}"
-                event_time = datetime.strptime(event_time_str, "%d/%m/%Y %H:%M")
-                event_time = self.config.TIMEZONE.localize(event_time)
-            except (ValueError, TypeError) as e:
-                logging.error(f"Formato de data/hora inválido para o evento {row.get('Evento', 'N/A')}: {e}")
-                continue
-            alert_time_start = event_time - timedelta(minutes=5)
-            if alert_time_start <= now < event_time:
-                alerts_to_show.append({
-                    "evento": row['Evento'], "moeda": row['Moeda'],
-                    "hora": row['Hora'], "importancia": row['Importância'],
-                    "key": alert_key
-                })
-        alerts_to_show.sort(key=lambda x: list(self.config.IMPORTANCE_STARS.keys()).index(x.get('importancia', 'Low')))
-        for alert_data in alerts_to_show:
-            self.play_sound()
-            self.app.show_alert_popup(alert_data)
-            self.dispatched_alerts.add(alert_data['key'])
-
-
-# --- MUDANÇA: Classe TaskScheduler agora gerencia duas tarefas ---
+                result["success"] = bool(self.refresh())
+            except Exception as e:
+                logging.error(f"Erro na atualização agendada: {e}")
+            with self._lock:
+                result["done"] = True
+                late = result.get("timed_out", False)
+            if late and result.get("success"):
+                self._late_success()
+
+        if self.timeout is None:
+            target()
+            return result.get("success", False)
+        # Uma busca travada não segura o agendador; se terminar depois, publica normalmente (gravação atômica)
+        self._worker = threading.Thread(target=target, daemon=True, name="refresh-worker")
+        self._worker.start()
+        self._worker.join(self.timeout)
+        with self._lock:
+            if not result.get("done"):
+                result["timed_out"] = True
+        if result.get("timed_out"):
+            logging.warning(f"Atualização passou de {self.timeout:.0f} s; segue em segundo plano e conta como falha.")
+            METRICS.inc("refresh_timeouts")
+            return False
+        return result.get("success", False)
+
+    def _late_success(self):
+        """Uma atualização que estourou o prazo terminou bem: cancela o backoff e volta aos horários normais."""
+        now = self.clock().astimezone(self.timezone)
+        with self._state_lock:
+            self.failures = 0
+            self.last_success = now
+            if not self._triggered:  # um trigger() chegado nesse meio-tempo continua valendo
+                self._schedule(now)
+            next_run = self.next_run
+        METRICS.inc("scheduled_refreshes")
+        if next_run: logging.info(f"Atualização atrasada concluída; próxima agendada: {next_run:%d/%m %H:%M:%S}.")
+        self._wakeup.set()
+
+    def _run(self, now):
+        with self._state_lock:
+            self.runs += 1
+            self._triggered = False
+        success = self._call_refresh()
+        with self._state_lock:
+            if success:
+                self.failures = 0
+                self.last_success = now
+            else:
+                self.failures += 1
+            # Um trigger() durante a busca já pôs next_run em "agora": não é sobrescrito
+            if not self._triggered:
+                if success:
+                    self._schedule(now)
+                else:
+                    delay = min(self.backoff_max, self.backoff_base * 2 ** (self.failures - 1))
+                    retry = now + timedelta(seconds=delay + self.rng.uniform(0, min(delay, self.jitter_seconds)))
+                    slot = self.next_slot(now)
+                    self.next_run = min(retry, slot) if slot else retry
+            next_run, failures = self.next_run, self.failures
+        if success:
+            METRICS.inc("scheduled_refreshes")
+            if next_run: logging.info(f"Próxima atualização agendada: {next_run:%d/%m %H:%M:%S}.")
+            return
+        METRICS.inc("scheduled_refresh_failures")
+        logging.warning(f"Atualização falhou ({failures}ª seguida); nova tentativa às {next_run:%H:%M:%S}.")
+
+    def trigger(self):
+        """Antecipa a próxima atualização para agora (ex.: comando "refresh" de outra instância)."""
+        with self._state_lock:
+            self.next_run = self.clock().astimezone(self.timezone)
+            self._triggered = True
+        self._wakeup.set()
+
+    def start(self):
+        if self.active.is_set(): return
+        logging.info(f"Atualizações agendadas no monitor: {', '.join(f'{h:02d}:{m:02d}' if h is not None else f'*:{m:02d}' for h, m in self.times)}.")
+        self.active.set()
+        threading.Thread(target=self._loop, daemon=True, name="refresh-scheduler").start()
+
+    def stop(self):
+        self.active.clear()
+        self._wakeup.set()
+
+    def _loop(self):
+        while self.active.is_set():
+            self._wakeup.clear()
+            delay = self.run_pending()
+            self._wakeup.wait(delay)
+
+
+def refresh_times_from_settings(settings, config):
+    """Horários de atualização de settings.json ("refresh_times"), ou REFRESH_TIMES se ausentes/inválidos."""
+    times = settings.get("refresh_times") or config.REFRESH_TIMES
+    try:
+        RefreshScheduler.parse_times(times)
+    except (ValueError, TypeError) as e:
+        logging.error(f"refresh_times inválido em settings.json ({e}); usando o padrão.")
+        times = config.REFRESH_TIMES
+    return times
+
+
+def settings_refresh(calendar_manager, settings, listeners=(), report=None):
+    """
+    Monta a função de atualização do RefreshScheduler: baixa o calendário com os filtros e países de
+    `settings` (lidos a cada chamada), avisa `listeners` (notify_calendar_changed) e entrega o resultado
+    a `report(success, message)`. Um país sem dados novos também conta como falha, para haver nova
+    tentativa com backoff.
+    """
+    def refresh():
+        importances, start_time, end_time = filters_from_settings(settings)
+        success, message = calendar_manager.download_calendar(importances, start_time, end_time, countries=countries_from_settings(settings))
+        if success:
+            for listener in listeners:
+                listener.notify_calendar_changed()
+        if report: report(success, message)
+        return success and not calendar_manager.last_failed_countries
+    return refresh
+
+
+# --- MUDANÇA: TaskScheduler só registra o watchdog; as atualizações ficam com o RefreshScheduler ---
 class TaskScheduler:
-    """Gerencia as tarefas agendadas no Windows, sem exibir janelas de console."""
+    """
+    Gerencia as tarefas agendadas no Windows, sem exibir janelas de console. As atualizações rodam
+    dentro do monitor (RefreshScheduler); as tarefas só servem de watchdog, abrindo o monitor
+    (oculto) no logon e a cada hora caso ele não esteja rodando.
+    """
     def __init__(self, config, exe_path):
         self.config = config
         # Adiciona o argumento para que as tarefas rodem em modo silencioso
-        self.exe_path_with_arg = f'"{exe_path}" --background-update'
+        self.exe_path_with_arg = f'"{exe_path}" --watchdog'
         
         # --- CORREÇÃO: Adiciona a flag para ocultar a janela do console ---
         # Este valor será usado em todas as chamadas de subprocess
         self.creation_flags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
 
-    def _create_task(self, task_name, schedule_type, time=""):
+    def _create_task(self, task_name, schedule_type, time="", modifier=""):
         """Função genérica para criar uma tarefa."""
-        query_cmd = ['schtasks', '/Query', '/TN', task_name]
+        query_cmd = ['schtasks', '/Query', '/TN', task_name, '/XML']
         # --- CORREÇÃO: Adiciona creationflags à chamada ---
-        if subprocess.run(query_cmd, capture_output=True, creationflags=self.creation_flags).returncode == 0:
+        query = subprocess.run(query_cmd, capture_output=True, creationflags=self.creation_flags)
+        # Tarefas de versões antigas (--background-update) são recriadas com o comando atual
+        if query.returncode == 0 and b"--watchdog" in query.stdout.replace(b"\x00", b""):
             logging.info(f"Tarefa '{task_name}' já existe.")
             return
 
@@ -241,6 +2196,8 @@ class TaskScheduler:
         ]
         if time:
             create_cmd.extend(['/ST', time])
+        if modifier:
+            create_cmd.extend(['/MO', modifier])
         
         try:
             # --- CORREÇÃO: Adiciona creationflags à chamada ---
@@ -264,374 +2221,208 @@ class TaskScheduler:
                 logging.error(f"Falha ao deletar tarefa '{task_name}': {e.stderr}")
 
     def create_all_tasks(self):
-        """Cria ambas as tarefas de atualização."""
+        """Cria as tarefas de watchdog (logon e a cada hora) e remove a diária das versões antigas."""
         self._create_task(self.config.TASK_NAME_LOGON, "ONLOGON")
-        self._create_task(self.config.TASK_NAME_DAILY, "DAILY", "08:30")
+        self._create_task(self.config.TASK_NAME_WATCHDOG, "HOURLY", modifier="1")
+        if subprocess.run(['schtasks', '/Query', '/TN', self.config.TASK_NAME_DAILY],
+                          capture_output=True, creationflags=self.creation_flags).returncode == 0:
+            self._delete_task(self.config.TASK_NAME_DAILY)
 
     def delete_all_tasks(self):
-        """Deleta ambas as tarefas de atualização."""
+        """Deleta todas as tarefas agendadas do app."""
         self._delete_task(self.config.TASK_NAME_LOGON)
+        self._delete_task(self.config.TASK_NAME_WATCHDOG)
         self._delete_task(self.config.TASK_NAME_DAILY)
 
 
 
 # ================== 3. INTERFACE GRÁFICA (UI) ==================
-
-class App(ttk.Window):
-    def __init__(self, config):
-        super().__init__(themename="litera", title=config.APP_NAME, size=(640, 500), resizable=(False, False))
-        self.config = config
-        self.withdraw()
-        
-        self.calendar_manager = CalendarManager(config)
-        self.alert_service = AlertService(config, self) 
-        # --- MUDANÇA: Passa a classe Config para o scheduler ---
-        self.scheduler = TaskScheduler(config, config.EXE_DESTINATION)
-        self.active_popups = []
-        
-        self.settings = self.load_settings()
-
-        self._setup_ui()
-        self._check_existing_csv()
-        
-        self.protocol("WM_DELETE_WINDOW", self._on_close)
-        self.center_window()
-        self.deiconify()
-
-    # (load_settings, save_settings, get_selected_sound inalterados)
-    def load_settings(self):
-        try:
-            if self.config.SETTINGS_FILE.exists():
-                with open(self.config.SETTINGS_FILE, 'r') as f:
-                    return json.load(f)
-        except (IOError, json.JSONDecodeError) as e:
-            logging.error(f"Erro ao carregar settings.json: {e}")
-        return {"selected_sound": "medium.mp3", "importances": ["low", "medium", "high"], "start_time": "08:45", "end_time": "17:45"}
-
-    def save_settings(self):
-        try:
-            with open(self.config.SETTINGS_FILE, 'w') as f:
-                json.dump(self.settings, f, indent=4)
-            logging.info("Configurações salvas com sucesso.")
-        except IOError as e:
-            logging.error(f"Erro ao salvar settings.json: {e}")
-
-    def get_selected_sound(self):
-        return self.settings.get("selected_sound")
-
-    def _setup_ui(self):
-        # (Código da UI quase todo inalterado, apenas o tamanho da janela e a chamada ao scheduler)
-        self.icon_path = self.config.IMAGE_DIR / "AJJ_ComCor.ico"
-        if self.icon_path.exists(): self.iconbitmap(self.icon_path)
-        main_frame = ttk.Frame(self, padding=10)
-        main_frame.pack(fill=BOTH, expand=YES)
-        config_frame = ttk.Frame(main_frame)
-        config_frame.pack(side=LEFT, fill=BOTH, expand=YES, padx=(0, 10))
-        config_frame.columnconfigure(0, weight=1)
-        config_frame.columnconfigure(1, weight=1)
-        ttk.Label(config_frame, text="Configurações de Filtro", font="-size 12 -weight bold").grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 15))
-        imp_frame = ttk.Labelframe(config_frame, text="Importância", padding=10)
-        imp_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(0, 10))
-        imp_frame.columnconfigure((0,1,2), weight=1)
-        self.vars = {
-            "Low": ttk.BooleanVar(value="low" in self.settings.get("importances", [])), 
-            "Medium": ttk.BooleanVar(value="medium" in self.settings.get("importances", [])), 
-            "High": ttk.BooleanVar(value="high" in self.settings.get("importances", []))
-        }
-        ttk.Checkbutton(imp_frame, text="Low (★)", variable=self.vars["Low"], bootstyle="primary").grid(row=0, column=0)
-        ttk.Checkbutton(imp_frame, text="Medium (★★)", variable=self.vars["Medium"], bootstyle="primary").grid(row=0, column=1)
-        ttk.Checkbutton(imp_frame, text="High (★★★)", variable=self.vars["High"], bootstyle="primary").grid(row=0, column=2)
-        time_frame = ttk.Labelframe(config_frame, text="Horários (HH:MM)", padding=10)
-        time_frame.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(0, 10))
-        time_frame.columnconfigure((0,1), weight=1)
-        start_frame = ttk.Frame(time_frame)
-        start_frame.grid(row=0, column=0, sticky="w")
-        ttk.Label(start_frame, text="Início:").pack(side=LEFT, padx=(0, 5))
-        self.h_inicio = ttk.Spinbox(start_frame, from_=0, to=23, width=4, format="%02.0f"); self.h_inicio.pack(side=LEFT)
-        self.m_inicio = ttk.Spinbox(start_frame, from_=0, to=59, width=4, format="%02.0f"); self.m_inicio.pack(side=LEFT, padx=(5,0))
-        start_h, start_m = self.settings.get("start_time", "08:45").split(':')
-        self.h_inicio.set(start_h); self.m_inicio.set(start_m)
-        end_frame = ttk.Frame(time_frame)
-        end_frame.grid(row=0, column=1, sticky="e")
-        ttk.Label(end_frame, text="Fim:").pack(side=LEFT, padx=(0, 5))
-        self.h_fim = ttk.Spinbox(end_frame, from_=0, to=23, width=4, format="%02.0f"); self.h_fim.pack(side=LEFT)
-        self.m_fim = ttk.Spinbox(end_frame, from_=0, to=59, width=4, format="%02.0f"); self.m_fim.pack(side=LEFT, padx=(5,0))
-        end_h, end_m = self.settings.get("end_time", "17:45").split(':')
-        self.h_fim.set(end_h); self.m_fim.set(end_m)
-        sound_frame = ttk.Labelframe(config_frame, text="Som do Alerta", padding=10)
-        sound_frame.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(0, 10))
-        sound_files = [f.name for f in self.config.SOUND_DIR.glob("*.mp3")]
-        self.sound_var = ttk.StringVar(value=self.settings.get("selected_sound"))
-        self.sound_selector = ttk.Combobox(sound_frame, textvariable=self.sound_var, values=sound_files, state="readonly")
-        self.sound_selector.pack(fill=X, expand=YES)
-        self.sound_selector.bind("<<ComboboxSelected>>", self.on_sound_select)
-        self.exec_button = ttk.Button(config_frame, text="Salvar e Monitorar", command=self.run_and_monitor, bootstyle="success")
-        self.exec_button.grid(row=4, column=0, columnspan=2, sticky="ew", pady=(10, 5), ipady=5)
-        self.test_button = ttk.Button(config_frame, text="Testar Notificação", command=self.test_notification, bootstyle="info")
-        self.test_button.grid(row=5, column=0, columnspan=2, sticky="ew", pady=5, ipady=5)
-        self.uninstall_button = ttk.Button(config_frame, text="Desinstalar", command=self.uninstall, bootstyle="danger-outline")
-        self.uninstall_button.grid(row=6, column=0, columnspan=2, sticky="ew", pady=5, ipady=5)
-        self.status_label = ttk.Label(config_frame, text="Pronto para iniciar.", bootstyle="secondary")
-        self.status_label.grid(row=7, column=0, columnspan=2, sticky="w", pady=(10, 0))
-        qr_frame = ttk.Frame(main_frame, width=230)
-        qr_frame.pack(side=RIGHT, fill=Y)
-        qr_path = self.config.IMAGE_DIR / "QRcode.png"
-        if qr_path.exists():
-            qr_img = Image.open(qr_path).resize((150, 150), Image.Resampling.LANCZOS)
-            self.qr_photo = ImageTk.PhotoImage(qr_img)
-            ttk.Label(qr_frame, image=self.qr_photo).pack(pady=10)
-        ttk.Label(qr_frame, text="Apoie o desenvolvedor!", font="-weight bold").pack()
-        social_frame = ttk.Frame(qr_frame)
-        social_frame.pack(pady=15)
-        social_frame.columnconfigure((0, 1, 2), weight=1)
-        self._create_social_button(social_frame, "linkedin.png", "https://www.linkedin.com/in/josue-p-santos" ).grid(row=0, column=0, padx=5)
-        self._create_social_button(social_frame, "github-mark.png", "https://github.com/Josue04Santos" ).grid(row=0, column=1, padx=5)
-        self._create_social_button(social_frame, "instagram.png", "https://www.instagram.com/josuepsantos" ).grid(row=0, column=2, padx=5)
-        logo_path = self.config.IMAGE_DIR / "AJJ_LogoColorido.png"
-        if logo_path.exists():
-            try:
-                logo_img = Image.open(logo_path).resize((150, 120), Image.Resampling.LANCZOS)
-                self.logo_photo = ImageTk.PhotoImage(logo_img)
-                ttk.Label(qr_frame, image=self.logo_photo).pack(pady=(10, 0))
-            except Exception as e:
-                logging.error(f"Erro ao carregar logo: {e}")
-        ttk.Label(qr_frame, text="Desenvolvido por Josue Santos", font="-size 8 -slant italic").pack(pady=(5, 10))
-
-    def on_sound_select(self, event=None):
-        # (Código inalterado)
-        selected_sound = self.sound_var.get()
-        self.settings["selected_sound"] = selected_sound
-        self.save_settings()
-        logging.info(f"Som do alerta alterado para: {selected_sound}")
-        self.alert_service.play_sound()
-
-    def test_notification(self):
-        # (Código inalterado)
-        logging.info("Disparando notificação de teste.")
-        test_data = { "evento": "Folha de Pagamento (Não-Agrícola)", "moeda": "USD", "hora": datetime.now().strftime("%H:%M"), "importancia": "High" }
-        self.alert_service.play_sound()
-        self.show_alert_popup(test_data)
-
-    def _create_social_button(self, parent, image_name, url):
-        # (Código inalterado)
-        path = self.config.IMAGE_DIR / image_name
-        if not path.exists(): 
-            logging.warning(f"Ícone social não encontrado: {image_name}")
-            return ttk.Frame(parent)
-        icon_img = Image.open(path).resize((32, 32), Image.Resampling.LANCZOS)
-        icon_photo = ImageTk.PhotoImage(icon_img)
-        button = ttk.Button(parent, image=icon_photo, bootstyle="link", command=lambda: webbrowser.open(url))
-        button.image = icon_photo
-        return button
-
-    def _check_existing_csv(self):
-        # (Código inalterado)
-        if self.config.CSV_FILE.exists():
-            try:
-                last_mod_ts = os.path.getmtime(self.config.CSV_FILE)
-                last_mod_dt = datetime.fromtimestamp(last_mod_ts)
-                self.status_label.config(text=f"Última atualização: {last_mod_dt:%d/%m/%Y %H:%M}")
-            except Exception as e:
-                logging.error(f"Erro ao verificar CSV existente: {e}")
-                self.status_label.config(text="Erro ao carregar CSV anterior.", bootstyle="danger")
-        else:
-            self.status_label.config(text="Nenhum calendário encontrado. Execute para baixar.")
-
-    def run_and_monitor(self):
-        # (Código inalterado, apenas a lógica de salvar as configurações)
-        self.exec_button.config(state=DISABLED)
-        self.status_label.config(text="Salvando e baixando dados...", bootstyle="info")
-        self.update_idletasks()
-        
-        importances = [key.lower() for key, var in self.vars.items() if var.get()]
-        start_time_str = f"{self.h_inicio.get()}:{self.m_inicio.get()}"
-        end_time_str = f"{self.h_fim.get()}:{self.m_fim.get()}"
-        
-        self.settings["importances"] = importances
-        self.settings["start_time"] = start_time_str
-        self.settings["end_time"] = end_time_str
-        self.save_settings()
-
-        try:
-            start_time = time(int(self.h_inicio.get()), int(self.m_inicio.get()))
-            end_time = time(int(self.h_fim.get()), int(self.m_fim.get()))
-        except ValueError:
-            ttk.dialogs.Messagebox.show_error("Horário inválido!", "Erro de Formato")
-            self.exec_button.config(state=NORMAL)
-            return
-            
-        threading.Thread(target=self._run_and_monitor_task, args=(importances, start_time, end_time), daemon=True).start()
-
-    def _run_and_monitor_task(self, importances, start_time, end_time):
-        # (Código inalterado)
-        success, message = self.calendar_manager.download_calendar(importances, start_time, end_time)
-        self.after(0, self._update_ui_after_download, success, message)
-
-    def _update_ui_after_download(self, success, message):
-        # --- MUDANÇA: Chama create_all_tasks ---
-        if success:
-            ttk.dialogs.Messagebox.show_info(message, "Sucesso")
-            self.scheduler.create_all_tasks() # Cria/atualiza AMBAS as tarefas
-            self.alert_service.start()
-            self.status_label.config(text="Monitoramento ativo. A janela pode ser fechada.")
-            self.withdraw()
-        else:
-            ttk.dialogs.Messagebox.show_error(message, "Falha no Download")
-            self.status_label.config(text="Falha ao baixar. Verifique o log.", bootstyle="danger")
-        self.exec_button.config(state=NORMAL)
-
-    def show_alert_popup(self, alert_data):
-        # (Código inalterado)
-        popup = ttk.Toplevel(title="Alerta de Evento Econômico", size=(380, 220))
-        popup.resizable(False, False)
-        if self.icon_path.exists(): popup.iconbitmap(self.icon_path)
-        importancia = alert_data.get('importancia', 'Low')
-        bootstyle_color = self.config.COLOR_MAP.get(importancia, "secondary")
-        stars = self.config.IMPORTANCE_STARS.get(importancia, '★')
-        header_frame = ttk.Frame(popup, bootstyle=bootstyle_color, height=60)
-        header_frame.pack(fill=X, side=TOP)
-        bell_icon = ttk.Label(header_frame, text="🔔", font=("Segoe UI Emoji", 24), bootstyle=f"{bootstyle_color}-inverse")
-        bell_icon.pack(side=LEFT, padx=15, pady=10)
-        header_text = f"Importância: {importancia} {stars}"
-        event_title = ttk.Label(header_frame, text=header_text, font="-size 14 -weight bold", bootstyle=f"{bootstyle_color}-inverse")
-        event_title.pack(side=LEFT, pady=10, fill=X, expand=YES)
-        body_frame = ttk.Frame(popup, padding=15)
-        body_frame.pack(fill=BOTH, expand=YES)
-        body_frame.columnconfigure(1, weight=1)
-        details = {"Moeda:": alert_data.get('moeda', 'N/A'), "Hora:": alert_data.get('hora', 'N/A'), "Evento:": alert_data.get('evento', 'N/A')}
-        for i, (label, value) in enumerate(details.items()):
-            ttk.Label(body_frame, text=label, font="-weight bold").grid(row=i, column=0, sticky="w", padx=(0, 10), pady=2)
-            value_label = ttk.Label(body_frame, text=value, wraplength=220)
-            value_label.grid(row=i, column=1, sticky="w", pady=2)
-        footer_frame = ttk.Frame(popup, padding=(10, 15), bootstyle="light")
-        footer_frame.pack(fill=X, side=BOTTOM)
-        footer_frame.columnconfigure((0,1), weight=1)
-        def close_popup():
-            if popup.winfo_exists():
-                if popup in self.active_popups: self.active_popups.remove(popup)
-                popup.destroy()
-                self._stack_popups()
-        def open_csv_and_close():
-            if self.config.CSV_FILE.exists(): os.startfile(self.config.CSV_FILE)
-            close_popup()
-        open_btn = ttk.Button(footer_frame, text="📄 Abrir CSV", command=open_csv_and_close, bootstyle="success")
-        open_btn.grid(row=0, column=0, sticky="ew", padx=(0, 5))
-        close_btn = ttk.Button(footer_frame, text="❌ Fechar", command=close_popup, bootstyle="secondary-outline")
-        close_btn.grid(row=0, column=1, sticky="ew", padx=(5, 0))
-        popup.attributes("-topmost", True)
-        
-        self.active_popups.append(popup)
-        self._stack_popups()
-        popup.after(30000, close_popup)
-
-    def _stack_popups(self):
-        # (Código inalterado)
-        screen_width, screen_height, gap, y_offset = self.winfo_screenwidth(), self.winfo_screenheight(), 10, 50
-        for popup in reversed(self.active_popups[:]):
-            if popup.winfo_exists():
-                width, height = 380, 220 
-                x = screen_width - width - 10
-                y = screen_height - height - y_offset
-                popup.geometry(f"{width}x{height}+{x}+{y}")
-                y_offset += height + gap
-
-    def uninstall(self):
-        # --- MUDANÇA: Chama delete_all_tasks ---
-        answer = ttk.dialogs.Messagebox.show_question("Tem certeza que deseja desinstalar?", "Confirmar Desinstalação")
-        if answer != "Yes": return
-        logging.info("Iniciando processo de desinstalação...")
-        self.alert_service.stop()
-        self.scheduler.delete_all_tasks() # Deleta AMBAS as tarefas
-        try:
-            if self.config.CSV_FILE.exists(): self.config.CSV_FILE.unlink()
-            if self.config.SETTINGS_FILE.exists(): self.config.SETTINGS_FILE.unlink()
-            if self.config.EXE_DESTINATION.exists() and getattr(sys, 'frozen', False):
-                 if sys.executable != str(self.config.EXE_DESTINATION): self.config.EXE_DESTINATION.unlink()
-            for popup in self.active_popups[:]:
-                if popup.winfo_exists(): popup.destroy()
-            ttk.dialogs.Messagebox.show_info("Programa desinstalado com sucesso.", "Desinstalação Concluída")
-            self._on_close(force=True)
-        except Exception as e:
-            logging.error(f"Erro durante a desinstalação: {e}")
-            ttk.dialogs.Messagebox.show_error(f"Falha ao desinstalar: {e}", "Erro")
-
-    def _on_close(self, force=False):
-        # (Código inalterado)
-        if self.alert_service.active.is_set() and not force:
-            self.withdraw()
-            ttk.dialogs.Messagebox.show_info(
-                "O aplicativo continua monitorando em segundo plano.", 
-                "Monitoramento Ativo"
-            )
-        else:
-            self.alert_service.stop()
-            self.quit()
-            self.destroy()
-
-    def center_window(self):
-        # (Código inalterado)
-        self.update_idletasks()
-        width, height = self.winfo_width(), self.winfo_height()
-        x, y = (self.winfo_screenwidth() // 2) - (width // 2), (self.winfo_screenheight() // 2) - (height // 2)
-        self.geometry(f'{width}x{height}+{x}+{y}')
+# A janela (App) fica em calendario_ui.py e só é importada no modo com interface,
+# para que o --background-update não carregue ttkbootstrap/PIL.
 
 # ================== 4. PONTO DE ENTRADA ==================
 
 # --- MUDANÇA: Nova função para rodar em modo silencioso ---
 def run_background_update():
     """
-    Executa apenas o download do CSV, sem interface gráfica.
-    É chamado pelas tarefas agendadas.
+    Executa apenas o download do CSV, sem interface gráfica (--background-update, para uso manual
+    ou de tarefas de versões antigas). As atualizações regulares rodam no RefreshScheduler do
+    monitor; a tarefa agendada atual só usa --watchdog para reabri-lo.
     """
     logging.info("Executando em modo de atualização em background...")
     app_config = Config()
+
+    # Com o monitor aberto, o refresh roda dentro dele (sem encerrá-lo nem duplicar o download)
+    if SingleInstance(app_config.DATA_DIR).send("refresh"):
+        logging.info("Atualização delegada à instância em execução.")
+        sys.exit(0)
     
     # Carrega as últimas configurações salvas pelo usuário
-    settings = {}
-    try:
-        if app_config.SETTINGS_FILE.exists():
-            with open(app_config.SETTINGS_FILE, 'r') as f:
-                settings = json.load(f)
-    except Exception as e:
-        logging.error(f"Não foi possível carregar configurações para background update: {e}")
+    settings = load_settings_file(app_config)
 
     # Usa as configurações salvas ou valores padrão
-    importances = settings.get("importances", ["low", "medium", "high"])
-    start_h, start_m = settings.get("start_time", "08:45").split(':')
-    end_h, end_m = settings.get("end_time", "17:45").split(':')
-    start_time = time(int(start_h), int(start_m))
-    end_time = time(int(end_h), int(end_m))
+    importances, start_time, end_time = filters_from_settings(settings)
 
-    calendar_manager = CalendarManager(app_config)
-    success, message = calendar_manager.download_calendar(importances, start_time, end_time)
+    calendar_manager = CalendarManager(app_config, create_calendar_source())
+    if '--timing' in sys.argv:
+        log_import_report("antes da primeira requisição")
+    success, message = calendar_manager.download_calendar(importances, start_time, end_time, countries=countries_from_settings(settings))
     
     if success:
         logging.info(f"Atualização em background concluída: {message}")
     else:
         logging.error(f"Falha na atualização em background: {message}")
+    METRICS.write_snapshot(app_config.METRICS_FILE)
+    if '--timing' in sys.argv:
+        log_import_report("fim da atualização")
     
     # Encerra o processo após a tarefa
     sys.exit(0)
 
 
+def create_notifiers(config, settings, names):
+    """Monta os notificadores do modo --daemon a partir dos nomes de --notify."""
+    notifiers = []
+    for name in names:
+        if name == "console":
+            notifiers.append(ConsoleNotifier(config))
+        elif name == "json":
+            notifiers.append(ConsoleNotifier(config, json_lines=True))
+        elif name == "jsonl":
+            notifiers.append(JsonLinesNotifier(config.ALERTS_JSONL_FILE))
+        elif name == "sound":
+            notifiers.append(SoundNotifier(config, settings.get("selected_sound", config.DEFAULT_SOUND), settings.get("sound_by_importance", False)))
+        elif name == "api":
+            # Aberto pelo AlertService.start(), junto com os demais notificadores
+            notifiers.append(EventApiServer(config, settings.get("api_port") or config.API_DEFAULT_PORT))
+        else:
+            logging.warning(f"Notificador desconhecido ignorado: {name}")
+    return notifiers
+
+
+def run_daemon():
+    """
+    Monitor sem interface gráfica (--daemon): alertas, valores 'Real' e atualização periódica, sem Tk.
+    Os alertas vão para os notificadores de --notify (ex.: --notify console,sound,api).
+    """
+    logging.info("Executando em modo daemon (sem interface gráfica)...")
+    app_config = Config()
+    instance = SingleInstance(app_config.DATA_DIR)
+    if not instance.acquire():
+        logging.warning("O monitor já está em execução (janela ou daemon); encerrando.")
+        sys.exit(1)
+
+    settings = load_settings_file(app_config)
+    names = sys.argv[sys.argv.index("--notify") + 1].split(",") if "--notify" in sys.argv[:-1] else app_config.DAEMON_NOTIFIERS
+    notifiers = create_notifiers(app_config, settings, [name.strip() for name in names if name.strip()])
+    logging.info(f"Notificadores ativos: {', '.join(type(n).__name__ for n in notifiers) or 'nenhum'}")
+
+    calendar_manager = CalendarManager(app_config, create_calendar_source())
+    alert_service = AlertService(app_config, notifiers)
+    actuals_tracker = ActualsTracker(app_config, calendar_manager)
+
+    stop_requested = threading.Event()
+    instance.handlers["show"] = lambda: logging.info("Modo daemon: não há janela para exibir.")
+    import signal
+    signal.signal(signal.SIGTERM, lambda *args: stop_requested.set())
+    METRICS.start_export(app_config.METRICS_FILE, app_config.METRICS_INTERVAL_SECONDS, settings.get("metrics_port"))
+
+    def report(success, message):
+        if success:
+            logging.info(f"Atualização do daemon concluída: {message}")
+        else:
+            logging.error(f"Falha na atualização do daemon: {message}")
+
+    refresh_scheduler = RefreshScheduler(
+        settings_refresh(calendar_manager, settings, (alert_service, actuals_tracker), report), refresh_times_from_settings(settings, app_config), app_config.TIMEZONE, app_config.REFRESH_JITTER_SECONDS,
+        app_config.REFRESH_BACKOFF_BASE_SECONDS, app_config.REFRESH_BACKOFF_MAX_SECONDS, timeout=app_config.REFRESH_TIMEOUT_SECONDS)
+    instance.handlers["refresh"] = refresh_scheduler.trigger
+    alert_service.start()  # até a primeira atualização terminar, monitora o último calendário publicado
+    actuals_tracker.start()
+    refresh_scheduler.trigger()  # primeira atualização já na abertura, com backoff se a fonte falhar
+    refresh_scheduler.start()
+    try:
+        # Espera em passos curtos para que Ctrl+C e SIGTERM sejam atendidos também no Windows
+        while not stop_requested.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+    refresh_scheduler.stop()
+    alert_service.stop()
+    actuals_tracker.stop()
+    for notifier in notifiers:
+        notifier.close()
+    METRICS.stop_export()
+    METRICS.write_snapshot(app_config.METRICS_FILE)
+    instance.release()
+    logging.info("Daemon encerrado.")
+
+
 if __name__ == "__main__":
+    setup_logging()
+    Config.ensure_dirs()
     # --- MUDANÇA: Verifica se deve rodar em modo background ou com UI ---
     if '--background-update' in sys.argv:
         run_background_update()
+    elif '--daemon' in sys.argv:
+        run_daemon()
     else:
         # Se não, executa o programa normalmente com a interface gráfica
         logging.info("Aplicação iniciada com interface gráfica.")
+        watchdog = '--watchdog' in sys.argv  # tarefa agendada: só abre o monitor (oculto) se ele não estiver rodando
+        instance = SingleInstance(Config.DATA_DIR)
+        if not instance.acquire():
+            if watchdog:
+                logging.info("Watchdog: o monitor já está em execução.")
+            elif instance.send("show"):
+                logging.info("O monitor já está em execução; janela existente exibida.")
+            else:
+                logging.warning("Outra instância detém o lock mas não respondeu ao comando.")
+            sys.exit(0)
 
-        if getattr(sys, 'frozen', False):
+        startup_probe = '--startup-probe' in sys.argv  # usado pelo build_exe.py para medir o tempo de abertura
+        if getattr(sys, 'frozen', False) and not startup_probe:
             if Path(sys.executable) != Config.EXE_DESTINATION:
                 import shutil
                 try:
-                    shutil.copy2(sys.executable, Config.EXE_DESTINATION)
+                    if Config.ONEDIR_BUILD:
+                        # No layout onedir o .exe depende da pasta _internal ao lado dele
+                        shutil.copytree(Path(sys.executable).parent, Config.EXE_DESTINATION.parent, dirs_exist_ok=True)
+                    else:
+                        shutil.copy2(sys.executable, Config.EXE_DESTINATION)
                     logging.info(f"Executável copiado para {Config.EXE_DESTINATION}")
                 except (IOError, shutil.Error) as e:
                     logging.error(f"Não foi possível copiar o executável: {e}")
 
+        # calendario_ui importa este módulo pelo nome; rodando como script ele é o __main__
+        sys.modules.setdefault("calendario_investing", sys.modules["__main__"])
+        App = timed_import("calendario_ui").App
+        if '--timing' in sys.argv:
+            log_import_report("interface carregada")
+
         app_config = Config()
-        app = App(app_config)
+        settings = load_settings_file(app_config)
+        api_server = None
+        if settings.get("api_port") and not startup_probe:
+            # Aberto já na abertura para as consultas; a lista de notificadores é fechada antes de o serviço de alertas começar
+            api_server = EventApiServer(app_config, settings["api_port"])
+            api_server.start()
+        # A medição de abertura (--startup-probe) não pode depender da rede: nada de monitoramento (alertas,
+        # valores divulgados, atualizações), que pode buscar dados antes de a janela fechar
+        app = App(app_config, create_calendar_source(), hidden=watchdog, notifiers=[api_server] if api_server else (),
+                  monitor_on_start=not startup_probe)
+        instance.handlers["show"] = lambda: app.after(0, app.show_window)
+        instance.handlers["refresh"] = lambda: app.after(0, app.refresh_now)
+        if startup_probe:
+            # Fecha assim que a janela fica ociosa: o tempo do processo é o tempo de abertura
+            app.after_idle(app.destroy)
+        else:
+            METRICS.start_export(app_config.METRICS_FILE, app_config.METRICS_INTERVAL_SECONDS, app.settings.get("metrics_port"))
         app.mainloop()
+        if api_server: api_server.stop()
+        METRICS.stop_export()
+        METRICS.write_snapshot(app_config.METRICS_FILE)
+        instance.release()
+        if app.uninstalled:
+            remove_app_data(app_config)  # o que ainda estava aberto (lock, banco) durante a desinstalação
         logging.info("Aplicação encerrada.")
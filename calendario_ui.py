@@ -0,0 +1,457 @@
+import os
+import sys
+import shutil
+import threading
+import logging
+from datetime import datetime, time
+import json
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from PIL import Image, ImageTk
+import webbrowser
+
+from calendario_investing import CalendarManager, AlertService, ActualsTracker, Notifier, SoundNotifier, TaskScheduler, RefreshScheduler, refresh_times_from_settings, settings_refresh, load_settings_file, filters_from_settings, countries_from_settings, remove_app_data, METRICS
+
+# ================== 3. INTERFACE GRÁFICA (UI) ==================
+
+class AlertPopup:
+    """Janela de alerta reaproveitável: os widgets são criados uma vez e, a cada alerta, só o conteúdo muda."""
+    WIDTH, HEIGHT = 380, 220
+    MAX_EVENT_LINES = 4  # alertas agrupados: eventos listados antes do "e mais N"
+
+    def __init__(self, app, on_close):
+        self.app = app
+        self.config = app.config
+        self.on_close = on_close
+        self.position = None
+        self._close_job = None
+
+        self.window = ttk.Toplevel(title="Alerta de Evento Econômico", size=(self.WIDTH, self.HEIGHT))
+        self.window.withdraw()
+        self.window.resizable(False, False)
+        if app.icon_path.exists(): self.window.iconbitmap(app.icon_path)
+        self.window.attributes("-topmost", True)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.header_frame = ttk.Frame(self.window, height=60)
+        self.header_frame.pack(fill=X, side=TOP)
+        self.bell_icon = ttk.Label(self.header_frame, text="🔔", font=("Segoe UI Emoji", 24))
+        self.bell_icon.pack(side=LEFT, padx=15, pady=10)
+        self.title_label = ttk.Label(self.header_frame, font="-size 14 -weight bold")
+        self.title_label.pack(side=LEFT, pady=10, fill=X, expand=YES)
+        body_frame = ttk.Frame(self.window, padding=15)
+        body_frame.pack(fill=BOTH, expand=YES)
+        body_frame.columnconfigure(1, weight=1)
+        self.value_labels = {}
+        for i, label in enumerate(("Moeda:", "Hora:", "Evento:")):
+            ttk.Label(body_frame, text=label, font="-weight bold").grid(row=i, column=0, sticky="w", padx=(0, 10), pady=2)
+            self.value_labels[label] = ttk.Label(body_frame, wraplength=220)
+            self.value_labels[label].grid(row=i, column=1, sticky="w", pady=2)
+        footer_frame = ttk.Frame(self.window, padding=(10, 15), bootstyle="light")
+        footer_frame.pack(fill=X, side=BOTTOM)
+        footer_frame.columnconfigure((0,1), weight=1)
+        open_btn = ttk.Button(footer_frame, text="📄 Abrir CSV", command=self.open_csv_and_close, bootstyle="success")
+        open_btn.grid(row=0, column=0, sticky="ew", padx=(0, 5))
+        close_btn = ttk.Button(footer_frame, text="❌ Fechar", command=self.close, bootstyle="secondary-outline")
+        close_btn.grid(row=0, column=1, sticky="ew", padx=(5, 0))
+
+    def fill(self, alert_data):
+        importancia = alert_data.get('importancia', 'Low')
+        bootstyle_color = self.config.COLOR_MAP.get(importancia, "secondary")
+        stars = self.config.IMPORTANCE_STARS.get(importancia, '★')
+        self.header_frame.configure(bootstyle=bootstyle_color)
+        self.bell_icon.configure(bootstyle=f"{bootstyle_color}-inverse")
+        events = alert_data.get('eventos') or [alert_data]
+        title = f"Importância: {importancia} {stars}"
+        if len(events) > 1:
+            title += f" ({len(events)} eventos)"
+        self.title_label.configure(text=title, bootstyle=f"{bootstyle_color}-inverse")
+        self.value_labels["Moeda:"].configure(text=", ".join(dict.fromkeys(e.get('moeda', 'N/A') for e in events)))
+        self.value_labels["Hora:"].configure(text=" / ".join(dict.fromkeys(e.get('hora', 'N/A') for e in events)))
+        if len(events) == 1:
+            self.value_labels["Evento:"].configure(text=alert_data.get('evento', 'N/A'))
+        else:
+            # Alerta agrupado: um evento por linha, já ordenados por importância
+            lines = [f"{self.config.IMPORTANCE_STARS.get(e.get('importancia'), '★')} {e.get('evento', 'N/A')}" for e in events[:self.MAX_EVENT_LINES]]
+            if len(events) > self.MAX_EVENT_LINES:
+                lines.append(f"... e mais {len(events) - self.MAX_EVENT_LINES}")
+            self.value_labels["Evento:"].configure(text="\n".join(lines))
+
+    def show(self):
+        self.window.deiconify()
+        self.window.lift()
+        if self._close_job: self.window.after_cancel(self._close_job)
+        self._close_job = self.window.after(30000, self.close)
+
+    def move_to(self, x, y):
+        """Reposiciona a janela só se a posição mudou."""
+        if self.position == (x, y): return
+        self.window.geometry(f"{self.WIDTH}x{self.HEIGHT}+{x}+{y}")
+        self.position = (x, y)
+
+    def close(self):
+        if self._close_job:
+            self.window.after_cancel(self._close_job)
+            self._close_job = None
+        self.window.withdraw()
+        self.on_close(self)
+
+    def open_csv_and_close(self):
+        if self.config.CSV_FILE.exists(): os.startfile(self.config.CSV_FILE)
+        self.close()
+
+
+class PopupPool:
+    """
+    Popups de alerta pré-criados e reaproveitados: fechar esconde a janela em vez de destruí-la,
+    e o empilhamento só move os popups cuja posição mudou. O total de janelas fica limitado a max_size.
+    """
+    def __init__(self, app, size=3, max_size=10):
+        self.app = app
+        self.max_size = max_size
+        self.active = []  # do mais antigo ao mais recente
+        self.idle = [self._create() for _ in range(size)]
+
+    @property
+    def created(self):
+        return len(self.active) + len(self.idle)
+
+    def _create(self):
+        return AlertPopup(self.app, on_close=self.release)
+
+    def _acquire(self):
+        if self.idle:
+            return self.idle.pop()
+        if self.created < self.max_size:
+            return self._create()
+        oldest = self.active[0]  # pool cheio: reaproveita o popup mais antigo
+        oldest.close()
+        return self.idle.pop()
+
+    def show(self, alert_data):
+        popup = self._acquire()
+        popup.fill(alert_data)
+        self.active.append(popup)
+        self.restack()
+        popup.show()
+
+    def release(self, popup):
+        if popup in self.active:
+            self.active.remove(popup)
+            self.idle.append(popup)
+            self.restack()
+
+    def restack(self):
+        screen_width, screen_height, gap, y_offset = self.app.winfo_screenwidth(), self.app.winfo_screenheight(), 10, 50
+        for popup in reversed(self.active):
+            x = screen_width - AlertPopup.WIDTH - 10
+            y = screen_height - AlertPopup.HEIGHT - y_offset
+            popup.move_to(x, y)
+            y_offset += AlertPopup.HEIGHT + gap
+
+    def destroy_all(self):
+        for popup in self.active + self.idle:
+            popup.window.destroy()
+        self.active, self.idle = [], []
+
+class PopupNotifier(Notifier):
+    """Entrega os alertas do AlertService à janela, que os mostra no pool de popups."""
+    def __init__(self, app):
+        self.app = app
+
+    def notify(self, alert_data):
+        self.app.show_alert_popup(alert_data)
+
+class App(ttk.Window):
+    def __init__(self, config, calendar_source=None, hidden=False, notifiers=(), monitor_on_start=True):
+        super().__init__(themename="litera", title=config.APP_NAME, size=(640, 500), resizable=(False, False))
+        self.config = config
+        self.withdraw()
+        
+        self.calendar_manager = CalendarManager(config, calendar_source)
+        self.sound_notifier = SoundNotifier(config, self.get_selected_sound, lambda: self.settings.get("sound_by_importance", False))
+        self.alert_service = AlertService(config, [self.sound_notifier, PopupNotifier(self), *notifiers])
+        self.actuals_tracker = ActualsTracker(config, self.calendar_manager)
+        # --- MUDANÇA: Passa a classe Config para o scheduler ---
+        self.scheduler = TaskScheduler(config, config.EXE_DESTINATION)
+        
+        self.settings = load_settings_file(config)
+        self.uninstalled = False
+        # Atualiza com as configurações salvas, sem diálogos; roda fora da thread da interface
+        self._refresh_from_settings = settings_refresh(self.calendar_manager, self.settings, (self.alert_service, self.actuals_tracker),
+                                                       lambda success, message: self.after(0, self._show_refresh_result, success, message))
+        self.refresh_scheduler = RefreshScheduler(
+            self._refresh_from_settings, refresh_times_from_settings(self.settings, config), config.TIMEZONE,
+            config.REFRESH_JITTER_SECONDS, config.REFRESH_BACKOFF_BASE_SECONDS, config.REFRESH_BACKOFF_MAX_SECONDS,
+            timeout=config.REFRESH_TIMEOUT_SECONDS)
+
+        self._setup_ui()
+        self.popup_pool = PopupPool(self, config.POPUP_POOL_SIZE, config.POPUP_POOL_MAX)
+        has_calendar = self._check_existing_calendar()
+        
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.center_window()
+        if monitor_on_start and (hidden or (has_calendar and self.config.SETTINGS_FILE.exists())):
+            # Já configurado: alerta desde já com o último calendário salvo e atualiza em segundo plano
+            # (watchdog abre oculto; sem calendário salvo, a primeira atualização também roda no agendador)
+            self.refresh_scheduler.trigger()  # antes de ligar o agendador, para a primeira volta já atender o pedido
+            self.start_monitoring()
+            if has_calendar: self.status_label.config(text=self.status_label.cget("text") + " — monitorando; atualizando...")
+        if not hidden:
+            self.deiconify()
+
+    def save_settings(self):
+        try:
+            with open(self.config.SETTINGS_FILE, 'w') as f:
+                json.dump(self.settings, f, indent=4)
+            logging.info("Configurações salvas com sucesso.")
+        except IOError as e:
+            logging.error(f"Erro ao salvar settings.json: {e}")
+
+    def get_selected_sound(self):
+        return self.settings.get("selected_sound", self.config.DEFAULT_SOUND)
+
+    def _setup_ui(self):
+        self.icon_path = self.config.IMAGE_DIR / "AJJ_ComCor.ico"
+        if self.icon_path.exists(): self.iconbitmap(self.icon_path)
+        main_frame = ttk.Frame(self, padding=10)
+        main_frame.pack(fill=BOTH, expand=YES)
+        config_frame = ttk.Frame(main_frame)
+        config_frame.pack(side=LEFT, fill=BOTH, expand=YES, padx=(0, 10))
+        config_frame.columnconfigure(0, weight=1)
+        config_frame.columnconfigure(1, weight=1)
+        ttk.Label(config_frame, text="Configurações de Filtro", font="-size 12 -weight bold").grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 15))
+        imp_frame = ttk.Labelframe(config_frame, text="Importância", padding=10)
+        imp_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(0, 10))
+        imp_frame.columnconfigure((0,1,2), weight=1)
+        importances = filters_from_settings(self.settings)[0]
+        self.vars = {
+            "Low": ttk.BooleanVar(value="low" in importances), 
+            "Medium": ttk.BooleanVar(value="medium" in importances), 
+            "High": ttk.BooleanVar(value="high" in importances)
+        }
+        ttk.Checkbutton(imp_frame, text="Low (★)", variable=self.vars["Low"], bootstyle="primary").grid(row=0, column=0)
+        ttk.Checkbutton(imp_frame, text="Medium (★★)", variable=self.vars["Medium"], bootstyle="primary").grid(row=0, column=1)
+        ttk.Checkbutton(imp_frame, text="High (★★★)", variable=self.vars["High"], bootstyle="primary").grid(row=0, column=2)
+        time_frame = ttk.Labelframe(config_frame, text="Horários (HH:MM)", padding=10)
+        time_frame.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(0, 10))
+        time_frame.columnconfigure((0,1), weight=1)
+        start_frame = ttk.Frame(time_frame)
+        start_frame.grid(row=0, column=0, sticky="w")
+        ttk.Label(start_frame, text="Início:").pack(side=LEFT, padx=(0, 5))
+        self.h_inicio = ttk.Spinbox(start_frame, from_=0, to=23, width=4, format="%02.0f"); self.h_inicio.pack(side=LEFT)
+        self.m_inicio = ttk.Spinbox(start_frame, from_=0, to=59, width=4, format="%02.0f"); self.m_inicio.pack(side=LEFT, padx=(5,0))
+        start_h, start_m = self.settings.get("start_time", "08:45").split(':')
+        self.h_inicio.set(start_h); self.m_inicio.set(start_m)
+        end_frame = ttk.Frame(time_frame)
+        end_frame.grid(row=0, column=1, sticky="e")
+        ttk.Label(end_frame, text="Fim:").pack(side=LEFT, padx=(0, 5))
+        self.h_fim = ttk.Spinbox(end_frame, from_=0, to=23, width=4, format="%02.0f"); self.h_fim.pack(side=LEFT)
+        self.m_fim = ttk.Spinbox(end_frame, from_=0, to=59, width=4, format="%02.0f"); self.m_fim.pack(side=LEFT, padx=(5,0))
+        end_h, end_m = self.settings.get("end_time", "17:45").split(':')
+        self.h_fim.set(end_h); self.m_fim.set(end_m)
+        sound_frame = ttk.Labelframe(config_frame, text="Som do Alerta", padding=10)
+        sound_frame.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(0, 10))
+        sound_files = [f.name for f in self.config.SOUND_DIR.glob("*.mp3")]
+        self.sound_var = ttk.StringVar(value=self.get_selected_sound())
+        self.sound_selector = ttk.Combobox(sound_frame, textvariable=self.sound_var, values=sound_files, state="readonly")
+        self.sound_selector.pack(fill=X, expand=YES)
+        self.sound_selector.bind("<<ComboboxSelected>>", self.on_sound_select)
+        self.exec_button = ttk.Button(config_frame, text="Salvar e Monitorar", command=self.run_and_monitor, bootstyle="success")
+        self.exec_button.grid(row=4, column=0, columnspan=2, sticky="ew", pady=(10, 5), ipady=5)
+        self.test_button = ttk.Button(config_frame, text="Testar Notificação", command=self.test_notification, bootstyle="info")
+        self.test_button.grid(row=5, column=0, columnspan=2, sticky="ew", pady=5, ipady=5)
+        self.uninstall_button = ttk.Button(config_frame, text="Desinstalar", command=self.uninstall, bootstyle="danger-outline")
+        self.uninstall_button.grid(row=6, column=0, columnspan=2, sticky="ew", pady=5, ipady=5)
+        self.status_label = ttk.Label(config_frame, text="Pronto para iniciar.", bootstyle="secondary")
+        self.status_label.grid(row=7, column=0, columnspan=2, sticky="w", pady=(10, 0))
+        qr_frame = ttk.Frame(main_frame, width=230)
+        qr_frame.pack(side=RIGHT, fill=Y)
+        self.qr_photo = self._load_image("QRcode.png")
+        if self.qr_photo:
+            ttk.Label(qr_frame, image=self.qr_photo).pack(pady=10)
+        ttk.Label(qr_frame, text="Apoie o desenvolvedor!", font="-weight bold").pack()
+        social_frame = ttk.Frame(qr_frame)
+        social_frame.pack(pady=15)
+        social_frame.columnconfigure((0, 1, 2), weight=1)
+        self._create_social_button(social_frame, "linkedin.png", "https://www.linkedin.com/in/josue-p-santos" ).grid(row=0, column=0, padx=5)
+        self._create_social_button(social_frame, "github-mark.png", "https://github.com/Josue04Santos" ).grid(row=0, column=1, padx=5)
+        self._create_social_button(social_frame, "instagram.png", "https://www.instagram.com/josuepsantos" ).grid(row=0, column=2, padx=5)
+        try:
+            self.logo_photo = self._load_image("AJJ_LogoColorido.png")
+            if self.logo_photo:
+                ttk.Label(qr_frame, image=self.logo_photo).pack(pady=(10, 0))
+        except Exception as e:
+            logging.error(f"Erro ao carregar logo: {e}")
+        ttk.Label(qr_frame, text="Desenvolvido por Josue Santos", font="-size 8 -slant italic").pack(pady=(5, 10))
+
+    def on_sound_select(self, event=None):
+        selected_sound = self.sound_var.get()
+        self.settings["selected_sound"] = selected_sound
+        self.save_settings()
+        logging.info(f"Som do alerta alterado para: {selected_sound}")
+        self.sound_notifier.play()
+
+    def test_notification(self):
+        logging.info("Disparando notificação de teste.")
+        test_data = { "evento": "Folha de Pagamento (Não-Agrícola)", "moeda": "USD", "hora": datetime.now().strftime("%H:%M"), "importancia": "High" }
+        self.sound_notifier.play(test_data["importancia"])
+        self.show_alert_popup(test_data)
+
+    def _load_image(self, image_name):
+        """Carrega uma imagem da interface no tamanho de UI_IMAGE_SIZES, usando a versão pré-redimensionada do build se existir."""
+        size = self.config.UI_IMAGE_SIZES[image_name]
+        resized_path = self.config.resized_image_path(image_name, size)
+        if resized_path.exists():
+            return ImageTk.PhotoImage(Image.open(resized_path))
+        path = self.config.IMAGE_DIR / image_name
+        if not path.exists(): return None
+        return ImageTk.PhotoImage(Image.open(path).resize(size, Image.Resampling.LANCZOS))
+
+    def _create_social_button(self, parent, image_name, url):
+        path = self.config.IMAGE_DIR / image_name
+        if not path.exists(): 
+            logging.warning(f"Ícone social não encontrado: {image_name}")
+            return ttk.Frame(parent)
+        icon_photo = self._load_image(image_name)
+        button = ttk.Button(parent, image=icon_photo, bootstyle="link", command=lambda: webbrowser.open(url))
+        button.image = icon_photo
+        return button
+
+    def _check_existing_calendar(self):
+        # Lê do banco interno (ver EventDatabase), não do CSV exportado para o Profit
+        try:
+            stats = self.calendar_manager.event_db.stats()
+        except Exception as e:
+            logging.error(f"Erro ao verificar calendário existente: {e}")
+            self.status_label.config(text="Erro ao carregar calendário anterior.", bootstyle="danger")
+            return False
+        if stats["refreshed_at"] and stats["events"]:
+            last_mod_dt = datetime.fromtimestamp(stats["refreshed_at"])
+            self.status_label.config(text=f"Última atualização: {last_mod_dt:%d/%m/%Y %H:%M} ({stats['events']} eventos)")
+            return True
+        self.status_label.config(text="Nenhum calendário encontrado. Execute para baixar.")
+        return False
+
+    def run_and_monitor(self):
+        self.exec_button.config(state=DISABLED)
+        self.status_label.config(text="Salvando e baixando dados...", bootstyle="info")
+        self.update_idletasks()
+        
+        importances = [key.lower() for key, var in self.vars.items() if var.get()]
+        start_time_str = f"{self.h_inicio.get()}:{self.m_inicio.get()}"
+        end_time_str = f"{self.h_fim.get()}:{self.m_fim.get()}"
+        
+        self.settings["importances"] = importances
+        self.settings["start_time"] = start_time_str
+        self.settings["end_time"] = end_time_str
+        self.save_settings()
+
+        try:
+            start_time = time(int(self.h_inicio.get()), int(self.m_inicio.get()))
+            end_time = time(int(self.h_fim.get()), int(self.m_fim.get()))
+        except ValueError:
+            ttk.dialogs.Messagebox.show_error("Horário inválido!", "Erro de Formato")
+            self.exec_button.config(state=NORMAL)
+            return
+            
+        threading.Thread(target=self._run_and_monitor_task, args=(importances, start_time, end_time), daemon=True).start()
+
+    def _run_and_monitor_task(self, importances, start_time, end_time):
+        success, message = self.calendar_manager.download_calendar(importances, start_time, end_time, countries=countries_from_settings(self.settings))
+        self.after(0, self._update_ui_after_download, success, message)
+
+    def _update_ui_after_download(self, success, message):
+        # --- MUDANÇA: Chama create_all_tasks ---
+        if success:
+            ttk.dialogs.Messagebox.show_info(message, "Sucesso")
+            self.scheduler.create_all_tasks() # Cria/atualiza as tarefas de watchdog
+            self.start_monitoring()
+            self.status_label.config(text="Monitoramento ativo. A janela pode ser fechada.")
+            self.withdraw()
+        else:
+            ttk.dialogs.Messagebox.show_error(message, "Falha no Download")
+            self.status_label.config(text="Falha ao baixar. Verifique o log.", bootstyle="danger")
+        self.exec_button.config(state=NORMAL)
+
+    def show_window(self):
+        self.deiconify()
+        self.lift()
+        self.focus_force()
+
+    def start_monitoring(self):
+        """Liga alertas, acompanhamento de valores divulgados e as atualizações agendadas."""
+        self.alert_service.notify_calendar_changed()
+        self.alert_service.start()
+        self.actuals_tracker.notify_calendar_changed()
+        self.actuals_tracker.start()
+        self.refresh_scheduler.start()
+
+    def refresh_now(self):
+        """Atualiza o calendário com as configurações salvas, sem diálogos (pedido vindo de outra instância)."""
+        if self.refresh_scheduler.active.is_set():
+            self.refresh_scheduler.trigger()
+        else:
+            threading.Thread(target=self._refresh_from_settings, daemon=True).start()
+
+    def _show_refresh_result(self, success, message):
+        self.status_label.config(text=message, bootstyle="secondary" if success else "danger")
+
+    def show_alert_popup(self, alert_data):
+        # Pode ser chamado pela thread de alertas: o Tk só é tocado na thread da interface
+        self.after(0, self._show_alert_popup, alert_data)
+
+    def _show_alert_popup(self, alert_data):
+        with METRICS.timer("popup_render_seconds"):
+            self.popup_pool.show(alert_data)
+        METRICS.set("popups_created", self.popup_pool.created)
+
+    def uninstall(self):
+        # --- MUDANÇA: Chama delete_all_tasks ---
+        answer = ttk.dialogs.Messagebox.show_question("Tem certeza que deseja desinstalar?", "Confirmar Desinstalação")
+        if answer != "Yes": return
+        logging.info("Iniciando processo de desinstalação...")
+        self.alert_service.stop()
+        self.actuals_tracker.stop()
+        self.refresh_scheduler.stop()
+        self.scheduler.delete_all_tasks() # Remove o watchdog (e a tarefa diária de versões antigas)
+        try:
+            # Fecha o que mantém arquivos abertos antes de apagar a pasta de dados
+            self.calendar_manager.event_db.close()
+            self.calendar_manager.translation_cache.close()
+            self.alert_service.event_index.event_db.close()
+            for notifier in self.alert_service.notifiers:
+                notifier.close()
+            remove_app_data(self.config)
+            self.uninstalled = True
+            if self.config.EXE_DESTINATION.exists() and getattr(sys, 'frozen', False):
+                 if sys.executable != str(self.config.EXE_DESTINATION):
+                     if self.config.ONEDIR_BUILD: shutil.rmtree(self.config.EXE_DESTINATION.parent, ignore_errors=True)
+                     else: self.config.EXE_DESTINATION.unlink()
+            self.popup_pool.destroy_all()
+            ttk.dialogs.Messagebox.show_info("Programa desinstalado com sucesso.", "Desinstalação Concluída")
+            self._on_close(force=True)
+        except Exception as e:
+            logging.error(f"Erro durante a desinstalação: {e}")
+            ttk.dialogs.Messagebox.show_error(f"Falha ao desinstalar: {e}", "Erro")
+
+    def _on_close(self, force=False):
+        if self.alert_service.active.is_set() and not force:
+            self.withdraw()
+            ttk.dialogs.Messagebox.show_info(
+                "O aplicativo continua monitorando em segundo plano.", 
+                "Monitoramento Ativo"
+            )
+        else:
+            self.alert_service.stop()
+            self.actuals_tracker.stop()
+            self.refresh_scheduler.stop()
+            self.quit()
+            self.destroy()
+
+    def center_window(self):
+        self.update_idletasks()
+        width, height = self.winfo_width(), self.winfo_height()
+        x, y = (self.winfo_screenwidth() // 2) - (width // 2), (self.winfo_screenheight() // 2) - (height // 2)
+        self.geometry(f'{width}x{height}+{x}+{y}')